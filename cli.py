@@ -6,22 +6,32 @@ For advanced usage, see pipeline.py and example_usage.py
 """
 
 from pathlib import Path
+from typing import Iterator
 from document_loader_api import read_file
 from parser_api import chat_with_model
-from pipeline import OCRParsingPipeline
+from pipeline import OCRParsingPipeline, iter_files
 from config import BHXH_SCHEMA
+from settings import DEFAULT_OCR_ENGINE, SCAN_MAX_WORKERS
 import json
+import traceback
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def get_all_files(root) -> list[str]:
+
+def iter_all_files(root, max_workers: int = SCAN_MAX_WORKERS) -> Iterator[str]:
+    """Lazily yield all files from a directory recursively"""
+    return iter_files(root, max_workers=max_workers)
+
+
+def get_all_files(root, max_workers: int = SCAN_MAX_WORKERS) -> list[str]:
     """Get all files from a directory recursively"""
-    p = Path(root)
-    if not p.exists() or not p.is_dir():
-        raise ValueError(f"Provided root path '{root}' is not a valid directory.")
-    return [str(f) for f in p.rglob("*") if f.is_file()]
+    return list(iter_all_files(root, max_workers=max_workers))
 
 
-def main():
+def main(max_concurrency: int = 8):
     """
     Main function demonstrating the OCR→Parsing pipeline
     
@@ -29,6 +39,9 @@ def main():
     - See example_usage.py for comprehensive examples
     - See README.md for full documentation
     - See test_pipeline.py to verify setup
+    
+    Args:
+        max_concurrency: Maximum documents being parsed at once
     """
     
     print("=" * 80)
@@ -39,7 +52,8 @@ def main():
     pipeline = OCRParsingPipeline(
         schema=BHXH_SCHEMA,
         langs=["en", "vi"],
-        ocr_engine="easyocr"
+        ocr_engine=DEFAULT_OCR_ENGINE,
+        use_cache=True
     )
     
     # Process all PDFs in data directory
@@ -47,25 +61,38 @@ def main():
     
     try:
         results = pipeline.process_directory(
-            "data"
+            "data",
+            max_concurrency=max_concurrency
         )
+        documents = results['documents']
+        total_files = results['meta']['total_files']
         
-        print(f"\n✅ Processed {results['meta']['total_files']} file(s)")
+        print(f"\n✅ Processed {total_files} file(s)")
         
         # Save results
         output_file = "parsing_results.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            Path(output_file).write_bytes(
+                orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
         
         print(f"\n💾 Full results saved to: {output_file}")
         
         # Calculate summary statistics
-        avg_confidence = sum(d['confidence'] for d in results['documents']) / len(results['documents']) if results['documents'] else 0
-        files_with_warnings = sum(1 for d in results['documents'] if d['warnings'])
+        confidence_sum = 0.0
+        files_with_warnings = 0
+        for d in documents:
+            confidence_sum += d['confidence']
+            if d['warnings']:
+                files_with_warnings += 1
+        avg_confidence = confidence_sum / len(documents) if documents else 0
         
         print(f"\n📊 Summary:")
         print(f"   Average confidence: {avg_confidence:.2%}")
-        print(f"   Files with warnings: {files_with_warnings}/{results['meta']['total_files']}")
+        print(f"   Files with warnings: {files_with_warnings}/{total_files}")
         
         print("\n" + "=" * 80)
         print("✅ Processing complete!")
@@ -81,7 +108,6 @@ def main():
         print("   Example: mkdir -p data && cp your_invoice.pdf data/")
     except Exception as e:
         print(f"\n❌ Unexpected error: {e}")
-        import traceback
         traceback.print_exc()
 
 
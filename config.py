@@ -32,6 +32,7 @@ BHXH_SCHEMA = {
   "Mã bệnh": {
     "type": "string",
     "description": "ICD disease code(s) from diagnosis, separated by semicolons (;). Each code starts with a letter followed by digits (e.g. A00, B00.1). If the first character is 0, correct to O.",
+    "format": "icd-codes",
     "example": "A00;B00.1;S92.4;O54;O84.1"
   },
 
@@ -89,3 +90,23 @@ BHXH_SCHEMA = {
 }
 
 
+# Label phrases that introduce each field in the OCR text, taken from the
+# field descriptions above. Kept out of BHXH_SCHEMA so the LLM prompt is unchanged.
+BHXH_TRIGGERS = {
+  "Loại giấy tờ": ["GIẤY", "GIAY"],
+  "Số seri": ["Mã Y tế", "Số seri"],
+  "Họ và tên người bệnh": ["Họ tên", "Người bệnh", "Chủ thẻ"],
+  "Mã BHXH": ["Mã BHXH", "Số BHXH", "Mã số BHXH"],
+  "Mã BHYT": ["BHYT", "Mã thẻ", "Số thẻ"],
+  "CCCD/CMND": ["CCCD", "CMND", "Số định danh cá nhân", "Hộ chiếu"],
+  "Mã bệnh": ["Chẩn đoán", "Kết luận"],
+  "Tên bệnh": ["Chẩn đoán", "Kết luận"],
+  "Ngày bắt đầu": ["Từ ngày", "Bắt đầu ngày"],
+  "Ngày kết thúc": ["đến ngày", "đến hết ngày"],
+  "Ngày vào viện": ["Vào viện", "Ngày vào viện"],
+  "Ghi chú": ["Ghi chú"],
+  "Ngày sinh của con": ["Ngày, tháng, năm sinh"],
+  "Họ và Tên Mẹ": ["Họ tên mẹ", "Họ, chữ đệm, tên người mẹ", "Tên mẹ"],
+  "Họ và Tên Cha": ["Họ tên cha", "Họ, chữ đệm, tên người cha", "Tên cha"],
+  "Số con sinh": ["Số con trong lần sinh này"]
+}
@@ -1,53 +1,81 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from langchain_core.documents import Document
 from docling.datamodel.base_models import InputFormat
 from docling.datamodel.pipeline_options import PdfPipelineOptions,AcceleratorOptions,AcceleratorDevice,EasyOcrOptions, TesseractCliOcrOptions
 from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling.backend.docling_parse_v2_backend import DoclingParseV2DocumentBackend
+from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
 from langchain_core.document_loaders import BaseLoader
 import json  # added
 import hashlib  # added
 import shutil
 from langchain_ollama import ChatOllama
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 default_root = "data"
 
 class DoclingLoader(BaseLoader):
-    def __init__(self, path: str | list[str]):
+    def __init__(self, path: str | list[str], max_workers: int | None = None, do_ocr: bool = True):
         self._file_paths = path if isinstance(path,list) else [path]
+        self.max_workers = max_workers or max(1, min(os.cpu_count() or 1, len(self._file_paths)))
 
         pipeline_options = PdfPipelineOptions()
-        pipeline_options.do_ocr = True
+        pipeline_options.do_ocr = do_ocr
         pipeline_options.ocr_options = TesseractCliOcrOptions(lang=["vie"],force_full_page_ocr=True)
-        
-
-        self._converter = DocumentConverter(
-            format_options={InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)}
-        )
-
-          
+        # Files are converted in parallel, so keep each worker's native thread pool small
+        pipeline_options.accelerator_options = AcceleratorOptions(num_threads=1)
+        self._pipeline_options = pipeline_options
+
+        # One converter per worker thread; a single converter is not safe to share
+        self._local = threading.local()
+
+    def _get_converter(self) -> DocumentConverter:
+        converter = getattr(self._local, "converter", None)
+        if converter is None:
+            converter = DocumentConverter(
+                format_options={InputFormat.PDF: PdfFormatOption(pipeline_options=self._pipeline_options, backend=PyPdfiumDocumentBackend)}
+            )
+            self._local.converter = converter
+        return converter
+
+    def _convert(self, path):
+        return self._get_converter().convert(path)
     
     def lazy_load(self):
-        for path in self._file_paths:
-            result = self._converter.convert(path)           # <-- keep ConversionResult
-            docling_doc = result.document
-            conf = result.confidence
-
-            text = docling_doc.export_to_markdown()
-            metadata = {
-                "source": str(Path(path).stem),
-                "confidence": {
-                    "mean_grade": conf.mean_grade,
-                    "low_grade": conf.low_grade,
-                    "ocr_score": conf.ocr_score,
-                    "layout_score": conf.layout_score,
-                    "parse_score": conf.parse_score,
-                    # # optional: per-page summaries
-                    # "pages": [{"index": p.index, "mean_grade": p.mean_grade, "ocr_score": p.ocr_score} for p in conf.pages],
-                },
-            }
-            print("text:" +text)
-            yield Document(page_content=text, metadata=metadata)
+        # Documents are yielded in completion order, not input order
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._convert, path): path for path in self._file_paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                result = future.result()           # <-- keep ConversionResult
+                yield self._to_document(path, result)
+
+    def _to_document(self, path, result):
+        docling_doc = result.document
+        conf = result.confidence
+
+        text = docling_doc.export_to_markdown()
+        metadata = {
+            "source": str(Path(path).stem),
+            "confidence": {
+                "mean_grade": conf.mean_grade,
+                "low_grade": conf.low_grade,
+                "ocr_score": conf.ocr_score,
+                "layout_score": conf.layout_score,
+                "parse_score": conf.parse_score,
+                # # optional: per-page summaries
+                # "pages": [{"index": p.index, "mean_grade": p.mean_grade, "ocr_score": p.ocr_score} for p in conf.pages],
+            },
+        }
+        print("text:" +text)
+        return Document(page_content=text, metadata=metadata)
 
     
     def cache(self, content, metadata):
@@ -67,19 +95,32 @@ class DoclingLoader(BaseLoader):
             "metadata": metadata,
         }
 
-        # If file exists with identical payload, skip rewrite
+        if orjson is not None:
+            data = orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        digest_path = file_path.with_name(f"{file_name}.sha256")
+
+        # If file exists with identical payload, skip rewrite. The sidecar digest
+        # avoids re-reading the cached file; fall back to hashing it if missing.
         if file_path.exists():
             try:
-                existing = json.loads(file_path.read_text(encoding="utf-8"))
-                if existing == payload:
+                if digest_path.exists():
+                    existing_digest = digest_path.read_text(encoding="utf-8").strip()
+                else:
+                    existing_digest = hashlib.sha256(file_path.read_bytes()).hexdigest()
+                if existing_digest == digest:
+                    if not digest_path.exists():
+                        digest_path.write_text(digest, encoding="utf-8")
                     return file_path
-            except Exception:
-                pass  # proceed to overwrite if unreadable / malformed
+            except OSError:
+                pass  # proceed to overwrite if unreadable
 
         tmp_path = file_path.with_suffix(".tmp")
-        with tmp_path.open("w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        tmp_path.write_bytes(data)
         tmp_path.replace(file_path)
+        digest_path.write_text(digest, encoding="utf-8")
 
         return file_path
 
@@ -1,22 +1,30 @@
 from langchain_ollama import ChatOllama
 from langchain_core.documents import Document
 import json
+from dataclasses import dataclass, fields
+from operator import attrgetter
+
+@dataclass(slots=True)
 class Response:
-    def __init__(self, content: str):
-        self.name : str= content[0]
-        self.dob : str = content[1]
-        self.medical_id : str = content[2]
-        self.request_type : int = content[3]
-        self.sysyem_type : int = content[4]
-        self.benefit_group : int = content[5]
-        self.personal_id: str = content[6]
-        self.start_date : str = content[7]
-        self.end_date : str = content[8]
-        self.total_days : int = content[9]
-        self.disease_code : str = content[10]
-        self.disease_name : str = content[11]
-        self.document_serial : str = content[12]
-        self.ocr_score : str = content[13]
+    name: str
+    dob: str
+    medical_id: str
+    request_type: int
+    system_type: int
+    benefit_group: int
+    personal_id: str
+    start_date: str
+    end_date: str
+    total_days: int
+    disease_code: str
+    disease_name: str
+    document_serial: str
+    ocr_score: str
+
+    @classmethod
+    def from_list(cls, content: list) -> "Response":
+        # The model may emit extra commas; keep the first len(fields) values as before
+        return cls(*content[:len(_RESPONSE_FIELDS)])
 
     @staticmethod
     def get_instruction() -> str:
@@ -38,10 +46,16 @@ class Response:
         OCR Score : str : The OCR score of the document
         """
     def to_list(self) -> list:
-        return [self.name,self.dob,self.medical_id,self.request_type,self.sysyem_type,self.benefit_group,self.personal_id,self.start_date,self.end_date,self.total_days,self.disease_code,self.disease_name,self.document_serial,self.ocr_score]
+        return list(_response_values(self))
     
     def to_string(self) -> str:
-        return f"[{self.name},{self.dob},{self.medical_id},{self.request_type},{self.sysyem_type},{self.benefit_group},{self.personal_id},{self.start_date},{self.end_date},{self.total_days},{self.disease_code},{self.disease_name},{self.document_serial},{self.ocr_score}]"
+        return "[" + ",".join(map(str, _response_values(self))) + "]"
+
+
+# Field order is fixed, so read all values in one C-level call instead of
+# astuple's per-field deepcopy
+_RESPONSE_FIELDS = tuple(f.name for f in fields(Response))
+_response_values = attrgetter(*_RESPONSE_FIELDS)
 
     
 class Parser:
@@ -74,15 +88,24 @@ class Parser:
             {doc.page_content}
             """
 
-        response = Response(remove_think_tag(self.llm.invoke([{"role": "user", "content": prompt}]).content).split(","))
+        response = Response.from_list(remove_think_tag(self.llm.invoke([{"role": "user", "content": prompt}]).content).split(","))
 
         print(response.to_string())
         return response
     
    
 def remove_think_tag(text: str) -> str:
-    import re
     # Remove <think>...</think> tags and their content
-    cleaned_text = re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL)
-    return cleaned_text.strip("\n").strip()
-
+    parts, i = [], 0
+    while True:
+        start = text.find("<think>", i)
+        if start < 0:
+            break
+        end = text.find("</think>", start + 7)
+        if end < 0:
+            # Unclosed tag: leave the remainder untouched
+            break
+        parts.append(text[i:start])
+        i = end + 8
+    parts.append(text[i:])
+    return "".join(parts).strip()
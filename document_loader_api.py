@@ -1,8 +1,12 @@
+import atexit
 import os
 import httpx
 import asyncio
-from typing import List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Sequence
 
+from json_utils import dumps, loads
+from ocr_cache import OCRCache
 from settings import (
     DOC_API_BASE_URL,
     DOC_API_TIMEOUT,
@@ -10,21 +14,33 @@ from settings import (
     DEFAULT_OCR_LANGS,
 )
 
-# Default options for document conversion
-DEFAULT_CONVERSION_OPTIONS = {
-    "from_formats": ["docx", "pptx", "html", "image", "pdf", "asciidoc", "md", "xlsx"],
+# Default options for document conversion. Read-only: every request spreads
+# these into its own payload, so no call can leak changes into the next.
+DEFAULT_CONVERSION_OPTIONS = MappingProxyType({
+    "from_formats": ("docx", "pptx", "html", "image", "pdf", "asciidoc", "md", "xlsx"),
     "image_export_mode": "placeholder",
     "do_ocr": True,
     "table_mode": "fast",
     "abort_on_error": False,
-}
+})
+
+# Shared client so repeated conversions reuse pooled keep-alive connections.
+# Transport retries only cover failed connects, before any of the body is sent.
+_CLIENT = httpx.Client(
+    timeout=DOC_API_TIMEOUT,
+    transport=httpx.HTTPTransport(
+        retries=2,
+        limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+    ),
+)
+atexit.register(_CLIENT.close)
 
 
 async def read_src(
     src: str,
     to_formats: Optional[List[str]] = None,
     ocr_engine: str = DEFAULT_OCR_ENGINE,
-    ocr_lang: Optional[List[str]] = None,
+    ocr_lang: Optional[Sequence[str]] = None,
     force_ocr: bool = False,
 ):
     """
@@ -33,8 +49,8 @@ async def read_src(
     Args:
         src: URL of the document to convert
         to_formats: Output formats (default: ["md", "json", "html", "text", "doctags"])
-        ocr_engine: OCR engine to use (default: "easyocr")
-        ocr_lang: Languages for OCR (default: ["en"])
+        ocr_engine: OCR engine to use (default: settings.DEFAULT_OCR_ENGINE)
+        ocr_lang: Languages for OCR (default: settings.DEFAULT_OCR_LANGS)
         force_ocr: Whether to force OCR even on text PDFs (default: False)
     
     Returns:
@@ -43,7 +59,7 @@ async def read_src(
     if to_formats is None:
         to_formats = ["md", "json", "html", "text", "doctags"]
     if ocr_lang is None:
-        ocr_lang = list(DEFAULT_OCR_LANGS)
+        ocr_lang = DEFAULT_OCR_LANGS
     
     url = f"{DOC_API_BASE_URL}/convert/source"
     payload = {
@@ -59,18 +75,54 @@ async def read_src(
     }
 
     async with httpx.AsyncClient(timeout=DOC_API_TIMEOUT) as client:
-        response = await client.post(url, json=payload)
+        response = await client.post(
+            url,
+            content=dumps(payload),
+            headers={"Content-Type": "application/json"},
+        )
         response.raise_for_status()
-        return response.json()
+        return loads(response.content)
+
+
+def _file_conversion_parameters(
+    to_formats: Optional[List[str]],
+    ocr_engine: str,
+    ocr_lang: Optional[Sequence[str]],
+    force_ocr: bool,
+    pdf_backend: str,
+) -> Dict[str, Any]:
+    """Build the form parameters for a /convert/file request."""
+    if to_formats is None:
+        to_formats = ["doctags"]
+    if ocr_lang is None:
+        ocr_lang = DEFAULT_OCR_LANGS
+
+    return {
+        **DEFAULT_CONVERSION_OPTIONS,
+        "to_formats": to_formats,
+        "force_ocr": force_ocr,
+        "ocr_engine": ocr_engine,
+        "ocr_lang": ocr_lang,
+        "pdf_backend": pdf_backend,
+    }
+
+
+def _extract_doctags(data: Any) -> str:
+    """Pull the DocTags text out of a /convert/file response body."""
+    try:
+        return data["document"]["doctags_content"]
+    except (KeyError, TypeError) as exc:
+        raise RuntimeError("Unexpected OCR API response structure.") from exc
 
 
 def read_file(
     file_path: str,
     to_formats: Optional[List[str]] = None,
     ocr_engine: str = DEFAULT_OCR_ENGINE,
-    ocr_lang: Optional[List[str]] = None,
+    ocr_lang: Optional[Sequence[str]] = None,
     force_ocr: bool = True,
     pdf_backend: str = "pypdfium2",
+    cache: Optional[OCRCache] = None,
 ):
     """
     Read and convert a document from a local file.
@@ -78,46 +130,212 @@ def read_file(
     Args:
         file_path: Path to the local file
         to_formats: Output formats (default: ["doctags"])
-        ocr_engine: OCR engine to use (default: "rapidocr")
-        ocr_lang: Languages for OCR (default: ["english"])
+        ocr_engine: OCR engine to use (default: settings.DEFAULT_OCR_ENGINE)
+        ocr_lang: Languages for OCR (default: settings.DEFAULT_OCR_LANGS)
         force_ocr: Whether to force OCR even on text PDFs (default: True)
         pdf_backend: PDF processing backend (default: "pypdfium2")
+        cache: Content-addressed cache to consult before calling the API (default: none)
     
     Returns:
         Converted document content (doctags format)
     """
     
+    parameters = _file_conversion_parameters(
+        to_formats, ocr_engine, ocr_lang, force_ocr, pdf_backend
+    )
+    return _convert_file(file_path, parameters, cache)
+
+
+def read_bytes(
+    data: bytes,
+    filename: str,
+    to_formats: Optional[List[str]] = None,
+    ocr_engine: str = DEFAULT_OCR_ENGINE,
+    ocr_lang: Optional[Sequence[str]] = None,
+    force_ocr: bool = True,
+    pdf_backend: str = "pypdfium2",
+    cache: Optional[OCRCache] = None,
+):
+    """
+    Read and convert a document already held in memory.
+    
+    Args:
+        data: Document bytes (e.g. an uploaded PDF)
+        filename: Name sent with the upload; its extension tells the API the format
+        to_formats: Output formats (default: ["doctags"])
+        ocr_engine: OCR engine to use (default: settings.DEFAULT_OCR_ENGINE)
+        ocr_lang: Languages for OCR (default: settings.DEFAULT_OCR_LANGS)
+        force_ocr: Whether to force OCR even on text PDFs (default: True)
+        pdf_backend: PDF processing backend (default: "pypdfium2")
+        cache: Content-addressed cache to consult before calling the API (default: none)
+    
+    Returns:
+        Converted document content (doctags format)
+    """
+    parameters = _file_conversion_parameters(
+        to_formats, ocr_engine, ocr_lang, force_ocr, pdf_backend
+    )
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_bytes_key(data, **parameters)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    doctags = _post_file(filename, data, parameters)
+    # Never cache empty output so a failed read is retried next time
+    if cache_key is not None and doctags and doctags.strip():
+        cache.set(cache_key, doctags)
+    return doctags
+
+
+# Parameters for the common case (PDF -> DocTags with forced rapidocr), built
+# once at import so read_pdf_doctags skips the per-call merge
+_PDF_DOCTAGS_PARAMETERS = _file_conversion_parameters(
+    ["doctags"], "rapidocr", DEFAULT_OCR_LANGS, True, "pypdfium2"
+)
+
+
+def read_pdf_doctags(file_path: str, cache: Optional[OCRCache] = None) -> str:
+    """
+    Convert a local PDF to DocTags with forced rapidocr OCR and default languages.
+    
+    Equivalent to read_file(file_path, ocr_engine="rapidocr", cache=cache) with
+    the remaining defaults, using parameters prepared at import.
+    """
+    return _convert_file(file_path, _PDF_DOCTAGS_PARAMETERS, cache)
+
+
+def _convert_file(
+    file_path: str,
+    parameters: Dict[str, Any],
+    cache: Optional[OCRCache],
+) -> str:
+    """Upload a local file to /convert/file and return its DocTags text."""
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
     
-    if to_formats is None:
-        to_formats = ["doctags"]
-    if ocr_lang is None:
-        ocr_lang = list(DEFAULT_OCR_LANGS)
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(file_path, **parameters)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    # Passing the open handle lets httpx stream the multipart body from disk
+    # in chunks instead of holding the whole file in memory
+    with open(file_path, "rb") as f:
+        doctags = _post_file(os.path.basename(file_path), f, parameters)
+
+    # Never cache empty output so a failed read is retried next time
+    if cache_key is not None and doctags and doctags.strip():
+        cache.set(cache_key, doctags)
+    return doctags
 
+
+def _post_file(filename: str, content: Any, parameters: Dict[str, Any]) -> str:
+    """Send one file (bytes or a binary handle) to /convert/file and return its DocTags text."""
     url = f"{DOC_API_BASE_URL}/convert/file"
-    parameters = {
-        **DEFAULT_CONVERSION_OPTIONS,
-        "to_formats": to_formats,
-        "force_ocr": force_ocr,
-        "ocr_engine": ocr_engine,
-        "ocr_lang": ocr_lang,
-        "pdf_backend": pdf_backend,
-    }
+    response = _CLIENT.post(url, files={"files": (filename, content)}, data=parameters)
+    response.raise_for_status()
+    return _extract_doctags(loads(response.content))
+
+
+async def read_file_async(
+    file_path: str,
+    to_formats: Optional[List[str]] = None,
+    ocr_engine: str = DEFAULT_OCR_ENGINE,
+    ocr_lang: Optional[Sequence[str]] = None,
+    force_ocr: bool = True,
+    pdf_backend: str = "pypdfium2",
+    client: Optional[httpx.AsyncClient] = None,
+    cache: Optional[OCRCache] = None,
+) -> str:
+    """
+    Async version of read_file.
+    
+    Args:
+        file_path: Path to the local file
+        to_formats: Output formats (default: ["doctags"])
+        ocr_engine: OCR engine to use
+        ocr_lang: Languages for OCR
+        force_ocr: Whether to force OCR even on text PDFs (default: True)
+        pdf_backend: PDF processing backend (default: "pypdfium2")
+        client: Shared AsyncClient to send the request with (default: a new one)
+        cache: Content-addressed cache to consult before calling the API (default: none)
+    
+    Returns:
+        Converted document content (doctags format)
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+    url = f"{DOC_API_BASE_URL}/convert/file"
+    parameters = _file_conversion_parameters(
+        to_formats, ocr_engine, ocr_lang, force_ocr, pdf_backend
+    )
+    cache_key = None
+    if cache is not None:
+        # Hashing reads the whole file, so keep it off the event loop too
+        cache_key = await asyncio.to_thread(cache.make_key, file_path, **parameters)
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        if cached is not None:
+            return cached
 
     filename = os.path.basename(file_path)
+
+    # Stream the body from disk in chunks rather than reading the file into memory
+    with open(file_path, "rb") as f:
+        files = {"files": (filename, f)}
+        if client is None:
+            async with httpx.AsyncClient(timeout=DOC_API_TIMEOUT) as own_client:
+                response = await own_client.post(url, files=files, data=parameters)
+        else:
+            response = await client.post(url, files=files, data=parameters)
+    response.raise_for_status()
+
+    doctags = _extract_doctags(loads(response.content))
+    if cache_key is not None and doctags and doctags.strip():
+        await asyncio.to_thread(cache.set, cache_key, doctags)
+    return doctags
+
+
+async def read_files_async(
+    file_paths: List[str],
+    concurrency: int = 8,
+    **kwargs: Any,
+) -> List[str]:
+    """
+    Convert several local files concurrently.
     
-    with httpx.Client(timeout=DOC_API_TIMEOUT) as client:
-        with open(file_path, "rb") as f:
-            files = {"files": (filename, f)}
-            response = client.post(url, files=files, data=parameters)
-            response.raise_for_status()
+    At most `concurrency` uploads are in flight at once, all sharing one
+    connection pool.
+    
+    Args:
+        file_paths: Paths to the local files
+        concurrency: Maximum number of simultaneous requests (default: 8)
+        **kwargs: Conversion options forwarded to read_file_async
+    
+    Returns:
+        Converted document contents (doctags format), in the order of file_paths
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    transport = httpx.AsyncHTTPTransport(
+        retries=2,
+        limits=httpx.Limits(max_connections=max(concurrency, 1)),
+    )
 
-    data = response.json()
-    try:
-        return data["document"]["doctags_content"]
-    except (KeyError, TypeError) as exc:
-        raise RuntimeError("Unexpected OCR API response structure.") from exc
+    async with httpx.AsyncClient(timeout=DOC_API_TIMEOUT, transport=transport) as client:
+        async def _read(path: str) -> str:
+            async with semaphore:
+                return await read_file_async(path, client=client, **kwargs)
+
+        return await asyncio.gather(*(_read(path) for path in file_paths))
+
+
+def read_files(file_paths: List[str], concurrency: int = 8, **kwargs: Any) -> List[str]:
+    """Blocking wrapper around read_files_async for synchronous callers."""
+    return asyncio.run(read_files_async(file_paths, concurrency=concurrency, **kwargs))
 
 
 if __name__ == "__main__":
@@ -1,30 +1,25 @@
-# from document_loader_api import read_file
+# import asyncio
+# from document_loader_api import read_file, read_files_async
+# from ocr_cache import OCRCache
 # from mistral_ocr import read_file_mistral
-# from pathlib import Path
+# from pipeline import scan_files
 # import time
 
 # path = "/Users/phu.mai/Projects/ocr/data"
 
 # def get_all_files(root) -> list[str]:
 #     """Get all files from a directory recursively"""
-#     p = Path(root)
-#     if not p.exists() or not p.is_dir():
-#         raise ValueError(f"Provided root path '{root}' is not a valid directory.")
-#     return [str(f) for f in p.rglob("*") if f.is_file()]
+#     # os.scandir walk: file/dir checks come from the directory listing, no extra stats
+#     return scan_files(root)
 
 # def test_read_file_time():
 #     files = get_all_files(path)
 #     files_num = len(files)
-#     total_time = 0.0
-#     for file in files:
-#         start = time.time()
-#         result = read_file_mistral(file)
-#         end = time.time()
-#         duration = end - start
-#         total_time += duration
-#         print(f"Time taken to process {file}: {duration} seconds")
+#     start = time.time()
+#     results = asyncio.run(read_files_async(files, concurrency=8, cache=OCRCache()))
+#     total_time = time.time() - start
 #     avg_time = total_time / files_num if files_num > 0 else 0
-#     print(f"Processed {files_num} files. Average time per file: {avg_time} seconds")
+#     print(f"Processed {files_num} files in {total_time} seconds. Average time per file: {avg_time} seconds")
 
 # def test_read_file_mistral_time():
 #     files = get_all_files(path)
@@ -0,0 +1,56 @@
+"""
+Deterministic extraction of fixed-format ID fields from OCR text.
+
+The BHXH number (10 digits) and CCCD (12 digits) have a fixed shape and follow
+known label phrases, so they can be read directly from the text: one pass of
+the trigger matcher locates the labels, then a short window after each label
+is checked for a digit run of exactly the expected length.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Optional
+
+from field_triggers import BHXH_TRIGGER_MATCHER, TriggerMatcher
+
+# Field name -> exact digit count of its value
+FIXED_DIGIT_FIELDS: Dict[str, int] = {
+    "Mã BHXH": 10,
+    "CCCD/CMND": 12,
+}
+
+# Characters after a label searched for the value; keeps a label from claiming
+# a number that belongs to a later field
+_WINDOW = 80
+
+_DIGIT_RUNS = {
+    length: re.compile(rf"(?<!\d)\d{{{length}}}(?!\d)")
+    for length in set(FIXED_DIGIT_FIELDS.values())
+}
+
+
+def extract_fixed_fields(
+    text: str,
+    matcher: Optional[TriggerMatcher] = None,
+) -> Dict[str, str]:
+    """
+    Find fixed-length ID values that directly follow their label phrases.
+
+    Returns:
+        Mapping of field name to the first matching value; fields without an
+        unambiguous match are omitted
+    """
+    if not text:
+        return {}
+    matcher = matcher or BHXH_TRIGGER_MATCHER
+
+    found: Dict[str, str] = {}
+    for field_name, _, end in matcher.find(text):
+        length = FIXED_DIGIT_FIELDS.get(field_name)
+        if length is None or field_name in found:
+            continue
+        match = _DIGIT_RUNS[length].search(text, end, end + _WINDOW)
+        if match:
+            found[field_name] = match.group(0)
+    return found
@@ -0,0 +1,52 @@
+"""
+Locate field label phrases in OCR text with a single scan.
+
+All trigger phrases are compiled into one alternation pattern when the matcher
+is built, so finding every field candidate in a document is one pass over the
+text instead of one substring search per phrase.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Sequence, Tuple
+
+from config import BHXH_TRIGGERS
+
+
+class TriggerMatcher:
+    """Case-insensitive multi-phrase matcher mapping phrases back to fields."""
+
+    def __init__(self, triggers: Dict[str, Sequence[str]]) -> None:
+        self.fields_by_phrase: Dict[str, Tuple[str, ...]] = {}
+        for field, phrases in triggers.items():
+            for phrase in phrases:
+                key = phrase.casefold()
+                fields = self.fields_by_phrase.get(key, ())
+                if field not in fields:
+                    self.fields_by_phrase[key] = fields + (field,)
+
+        # Longest phrases first so "Ngày vào viện" wins over "Vào viện" at the same position
+        phrases = sorted(self.fields_by_phrase, key=len, reverse=True)
+        self.pattern = re.compile(
+            "|".join(re.escape(phrase) for phrase in phrases), re.IGNORECASE
+        ) if phrases else None
+
+    def find(self, text: str) -> List[Tuple[str, int, int]]:
+        """
+        Find every trigger phrase in text.
+
+        Returns:
+            List of (field_name, start, end) tuples in text order; a phrase shared
+            by several fields yields one tuple per field.
+        """
+        if self.pattern is None or not text:
+            return []
+        matches: List[Tuple[str, int, int]] = []
+        for match in self.pattern.finditer(text):
+            for field in self.fields_by_phrase.get(match.group(0).casefold(), ()):
+                matches.append((field, match.start(), match.end()))
+        return matches
+
+
+BHXH_TRIGGER_MATCHER = TriggerMatcher(BHXH_TRIGGERS)
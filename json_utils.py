@@ -0,0 +1,38 @@
+"""
+JSON encoding helpers that use orjson when it is installed.
+
+orjson is several times faster than the stdlib encoder for the multi-KB
+prompts and OCR payloads sent to the remote services; the stdlib json module
+is used as a drop-in fallback so orjson stays optional.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_indented(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes indented by two spaces, for downloads."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str. Raises ValueError on invalid input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,73 @@
+"""
+Content-addressed cache for LLM responses.
+
+Entries are keyed by a hash of the model name plus the exact prompt, so
+re-parsing an unchanged document skips the round-trip while switching models
+invalidates old answers automatically. Recent hits are also kept in memory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from settings import LLM_CACHE_DIR, LLM_MODEL
+
+_MEMORY_SIZE = 4096
+
+
+class LLMCache:
+    """Directory of cached completions, one file per (model, prompt) key."""
+
+    def __init__(self, cache_dir: Optional[str] = None, memory_size: int = _MEMORY_SIZE) -> None:
+        self.cache_dir = Path(cache_dir or LLM_CACHE_DIR).expanduser()
+        self.memory_size = memory_size
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        # Documents are parsed from worker threads, so guard the in-memory LRU
+        self._lock = threading.Lock()
+
+    def make_key(self, message: str, model: str = LLM_MODEL) -> str:
+        key_json = json.dumps({"model": model, "message": message}, sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(key_json.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.txt"
+
+    def _remember(self, key: str, content: str) -> None:
+        with self._lock:
+            self._memory[key] = content
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            content = self._memory.get(key)
+            if content is not None:
+                self._memory.move_to_end(key)
+                return content
+        try:
+            content = self._path(key).read_text(encoding="utf-8")
+        except OSError:
+            return None
+        self._remember(key, content)
+        return content
+
+    def set(self, key: str, content: str) -> None:
+        """Store a reply; a failed disk write only loses the on-disk copy."""
+        self._remember(key, content)
+        path = self._path(key)
+        # Write to a temp file first so readers never see a partial entry
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(content, encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError:
+            # An unwritable cache directory must never fail the parse
+            tmp_path.unlink(missing_ok=True)
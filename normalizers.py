@@ -0,0 +1,24 @@
+"""
+Post-processing for extracted field values.
+
+Patterns are compiled once at import and the normalizers are memoized, so
+repeated values across documents (common in evaluation runs) are returned
+without re-scanning.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+# ICD-10 code: one letter, two digits, optional subcategory (e.g. A00, B00.1)
+_ICD_CODE = re.compile(r"\b[A-Z]\d{2}(?:\.\d+)?\b")
+# OCR often reads a leading "O" (obstetric chapter) as the digit zero
+_ZERO_FOR_O = re.compile(r"\b0(?=\d{2}(?:\.\d+)?\b)")
+
+
+@lru_cache(maxsize=2048)
+def normalize_icd(value: str) -> str:
+    """Return the ICD codes found in value, joined by semicolons ("" if none)."""
+    text = _ZERO_FOR_O.sub("O", value.upper())
+    return ";".join(_ICD_CODE.findall(text))
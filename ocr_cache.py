@@ -0,0 +1,82 @@
+"""
+Content-addressed on-disk cache for OCR output.
+
+Entries are keyed by a hash of the document bytes plus the OCR options that
+produced them, so re-running the pipeline over unchanged files skips OCR while
+switching engine or languages still triggers a fresh read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from settings import OCR_CACHE_DIR
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: str) -> str:
+    """Return the hex digest of a file's contents, read in chunks.
+
+    Digests are memoized on (path, size, mtime), so asking again for an
+    unchanged file skips re-reading it; the stored entries themselves are
+    still keyed by content.
+    """
+    stat = os.stat(file_path)
+    return _hash_file(os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=1024)
+def _hash_file(file_path: str, size: int, mtime_ns: int) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_options(options: dict) -> str:
+    options_json = json.dumps(options, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(options_json.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class OCRCache:
+    """Directory of cached DocTags text, one file per (content, options) key."""
+
+    def __init__(self, cache_dir: Optional[str] = None) -> None:
+        self.cache_dir = Path(cache_dir or OCR_CACHE_DIR).expanduser()
+
+    def make_key(self, file_path: str, **options: Any) -> str:
+        return f"{hash_file(file_path)}_{_hash_options(options)}"
+
+    def make_bytes_key(self, data: bytes, **options: Any) -> str:
+        """Key for a document held in memory; matches make_key for the same bytes."""
+        return f"{hashlib.blake2b(data, digest_size=16).hexdigest()}_{_hash_options(options)}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.doctags"
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            return self._path(key).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def set(self, key: str, content: str) -> None:
+        """Store DocTags on disk, best-effort: write failures are ignored."""
+        path = self._path(key)
+        # Write to a temp file first so readers never see a partial entry
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(content, encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError:
+            # The OCR already succeeded; a cache miss next time is the only cost
+            tmp_path.unlink(missing_ok=True)
@@ -1,22 +1,33 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import os
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 from dotenv import load_dotenv
 
+from json_utils import dumps, loads
+from llm_cache import LLMCache
 from settings import LLM_API_URL, LLM_MODEL, LLM_API_TIMEOUT
 
 
 load_dotenv()
 
+# Shared client so consecutive LLM calls reuse pooled keep-alive connections.
+# Transport retries only cover failed connects, before the prompt is sent.
+_CLIENT = httpx.Client(
+    timeout=LLM_API_TIMEOUT,
+    transport=httpx.HTTPTransport(
+        retries=2,
+        limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+    ),
+)
+atexit.register(_CLIENT.close)
 
-def chat_with_model(message: str) -> str:
-    """Send a prompt to the LLM API and return the assistant content.
 
-    Raises a RuntimeError with details when the API fails or returns an unexpected payload.
-    """
+def _build_request(message: str) -> Tuple[Dict[str, str], Dict[str, Any]]:
     api_key = os.getenv("OPENWEB_UI_API")
     if not api_key:
         raise RuntimeError("OPENWEB_UI_API is not set in environment.")
@@ -33,16 +44,72 @@ def chat_with_model(message: str) -> str:
         "top_p": 0.1,
         "stream": False,
     }
+    return headers, payload
 
-    try:
-        with httpx.Client(timeout=LLM_API_TIMEOUT) as client:
-            resp = client.post(LLM_API_URL, headers=headers, json=payload)
-            resp.raise_for_status()
-            data = resp.json()
-    except httpx.HTTPError as exc:
-        raise RuntimeError(f"LLM API request failed: {exc}") from exc
 
+def _extract_content(data: Any) -> str:
     try:
         return data["choices"][0]["message"]["content"]
     except (KeyError, IndexError, TypeError) as exc:
         raise RuntimeError("Unexpected LLM API response structure.") from exc
+
+
+def chat_with_model(message: str, cache: Optional[LLMCache] = None) -> str:
+    """Send a prompt to the LLM API and return the assistant content.
+
+    When a cache is given, a previous answer to the same prompt and model is returned
+    without calling the API.
+    Raises a RuntimeError with details when the API fails or returns an unexpected payload.
+    """
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(message)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    headers, payload = _build_request(message)
+
+    try:
+        resp = _CLIENT.post(LLM_API_URL, headers=headers, content=dumps(payload))
+        resp.raise_for_status()
+        data = loads(resp.content)
+    except httpx.HTTPError as exc:
+        raise RuntimeError(f"LLM API request failed: {exc}") from exc
+
+    content = _extract_content(data)
+    if cache_key is not None and content:
+        cache.set(cache_key, content)
+    return content
+
+
+async def chat_with_model_batch_async(messages: List[str], concurrency: int = 8) -> List[str]:
+    """Send several prompts concurrently and return the contents in input order.
+
+    At most `concurrency` requests are in flight at once, sharing one connection pool.
+    Raises a RuntimeError on the first failed request, like chat_with_model.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    transport = httpx.AsyncHTTPTransport(
+        retries=2,
+        limits=httpx.Limits(max_connections=max(concurrency, 1)),
+    )
+
+    async with httpx.AsyncClient(timeout=LLM_API_TIMEOUT, transport=transport) as client:
+        async def _chat(message: str) -> str:
+            headers, payload = _build_request(message)
+            async with semaphore:
+                try:
+                    resp = await client.post(LLM_API_URL, headers=headers, content=dumps(payload))
+                    resp.raise_for_status()
+                    data = loads(resp.content)
+                except httpx.HTTPError as exc:
+                    raise RuntimeError(f"LLM API request failed: {exc}") from exc
+            return _extract_content(data)
+
+        return await asyncio.gather(*(_chat(message) for message in messages))
+
+
+def chat_with_model_batch(messages: List[str], concurrency: int = 8) -> List[str]:
+    """Blocking wrapper around chat_with_model_batch_async for synchronous callers."""
+    return asyncio.run(chat_with_model_batch_async(messages, concurrency=concurrency))
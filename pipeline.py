@@ -7,16 +7,352 @@ This module implements a comprehensive pipeline that:
 3. Validates, normalizes, and computes confidence scores
 """
 
+import hashlib
 import json
+import math
+import os
 import re
+from collections import OrderedDict, deque
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-from datetime import datetime
-from document_loader_api import read_file
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar, Union
+from datetime import date, datetime
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from document_loader_api import read_bytes, read_file
 from parser_api import chat_with_model
+from json_utils import loads as json_loads
+from ocr_cache import OCRCache
+from llm_cache import LLMCache
+from normalizers import normalize_icd
+from extractors import extract_fixed_fields
+from settings import SCAN_MAX_WORKERS
 import csv
 # from mistral_ocr import read_file_mistral
 
+
+# Patterns used per field per document, compiled once
+_RE_NUM_CLEAN = re.compile(r'[^\d.,\-]')
+# DocTags lines kept when truncating: headers and page anchors near the line
+# start. Matches include the preceding newline; a literal first char keeps the
+# scan fast compared with a MULTILINE '^'.
+_RE_ANCHOR_LINE = re.compile(r'\n(?:#|[^\n]{0,16}Page)[^\n]*')
+# Date layouts found anywhere in a noisy OCR string, tried in priority order;
+# (pattern, year-first)
+_DATE_PATTERNS = (
+    (re.compile(r'(\d{4})-(\d{2})-(\d{2})'), True),   # ISO format
+    (re.compile(r'(\d{2})/(\d{2})/(\d{4})'), False),  # DD/MM/YYYY
+    (re.compile(r'(\d{2})-(\d{2})-(\d{4})'), False),  # DD-MM-YYYY
+    (re.compile(r'(\d{4})/(\d{2})/(\d{2})'), True),   # YYYY/MM/DD
+)
+
+
+@lru_cache(maxsize=256)
+def _compiled_regex(pattern: str) -> "re.Pattern[str]":
+    """Compile a schema-supplied regex once per distinct pattern"""
+    return re.compile(pattern)
+
+
+_JSON_DECODER = json.JSONDecoder()
+# Characters that change brace depth or string state in extract_json_object
+_RE_JSON_TOKEN = re.compile(r'[{}"\\]')
+
+# Appended to the parsing prompt on each retry after an invalid response
+RETRY_SUFFIX = "\n\nIMPORTANT: Your previous response was invalid. Return ONLY valid JSON, no other text."
+
+# Distinct (field, value) validations remembered per pipeline before resetting
+_VALIDATION_CACHE_SIZE = 4096
+
+# Distinct DocTags texts whose parsed LLM output is reused per pipeline
+_PARSED_CACHE_SIZE = 10_000
+
+# Rows written, or seconds elapsed, before the results CSV is flushed to disk
+_CSV_FLUSH_ROWS = 64
+_CSV_FLUSH_SECONDS = 5.0
+
+_T = TypeVar("_T")
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the first complete top-level JSON object embedded in text
+    
+    Only top-level '{' positions (brace depth 0, found by a depth counter that
+    skips braces inside strings) are tried with the C scanner's raw_decode,
+    which stops at the object's closing brace, so prose after the object does
+    not matter. A malformed outer object is never replaced by one of its
+    nested objects.
+    
+    Args:
+        text: Text that may contain a JSON object, e.g. a verbose LLM reply
+        
+    Returns:
+        Parsed object, or None if no valid object is found
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for match in _RE_JSON_TOKEN.finditer(text):
+        char = match.group()
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            # Quotes in prose around the object are not JSON strings
+            in_string = depth > 0
+        elif char == '{':
+            if depth == 0:
+                try:
+                    return _JSON_DECODER.raw_decode(text, match.start())[0]
+                except ValueError:
+                    pass
+            depth += 1
+        elif char == '}':
+            depth = max(depth - 1, 0)
+    return None
+
+
+def parse_number(value: str) -> float:
+    """
+    Parse a number written with currency symbols and locale separators
+    
+    Plain digit strings (day counts, child counts) take a direct float()
+    fast path; anything else is cleaned and its decimal separator inferred.
+    
+    Args:
+        value: Number text, e.g. "1.234,56 VND" or "12"
+        
+    Returns:
+        Parsed value
+        
+    Raises:
+        ValueError: If no number can be read from value
+    """
+    if value.isascii() and value.isdigit():
+        return float(value)
+    
+    # Remove common currency symbols and separators
+    cleaned = _RE_NUM_CLEAN.sub('', value)
+    # Handle locale-specific formats (e.g., 1.234,56 -> 1234.56)
+    last_comma = cleaned.rfind(',')
+    last_dot = cleaned.rfind('.')
+    if last_comma >= 0 and last_dot >= 0:
+        # Determine which is decimal separator
+        if last_comma > last_dot:
+            cleaned = cleaned.replace('.', '').replace(',', '.')
+        else:
+            cleaned = cleaned.replace(',', '')
+    elif last_comma >= 0:
+        # Assume comma is thousands separator unless two digits follow the last one
+        if len(cleaned) - last_comma - 1 == 2:
+            cleaned = cleaned.replace(',', '.')
+        else:
+            cleaned = cleaned.replace(',', '')
+    return float(cleaned)
+
+
+def normalize_date(value: str) -> Optional[str]:
+    """
+    Convert a date string to ISO YYYY-MM-DD
+    
+    A value that is exactly a valid date in a known layout is converted by
+    slicing; anything else (surrounding OCR noise, impossible dates) is
+    searched with each layout in priority order (ISO first), and the first
+    layout that matches is rewritten.
+    
+    Args:
+        value: Date text, e.g. "20/12/2023" or "Ngày 2023-12-20"
+        
+    Returns:
+        ISO date string, or None if no date-shaped text was found
+    """
+    text = value.strip()
+    if len(text) == 10:
+        sep = text[4]
+        if sep in '-/' and text[7] == sep:
+            year, month, day = text[0:4], text[5:7], text[8:10]
+        else:
+            sep = text[2]
+            year, month, day = text[6:10], text[3:5], text[0:2]
+            if sep not in '-/' or text[5] != sep:
+                year = None
+        if year is not None and (year + month + day).isdigit():
+            try:
+                return date(int(year), int(month), int(day)).isoformat()
+            except ValueError:
+                pass
+    
+    for pattern, year_first in _DATE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            first, month, last = match.groups()
+            if year_first:
+                return f"{first}-{month}-{last}"
+            return f"{last}-{month}-{first}"
+    return None
+
+
+class FieldRule(NamedTuple):
+    """Per-field validation settings resolved once from the schema"""
+    name: str
+    schema: Dict[str, Any]
+    required: bool
+    nullable: bool
+    type: Optional[str]
+    format: Optional[str]
+    regex: Optional["re.Pattern[str]"]
+    enum: Optional[Union[frozenset, Tuple[Any, ...]]]
+
+
+def _enum_values(values: Iterable[Any]) -> Union[frozenset, Tuple[Any, ...]]:
+    """Allowed enum values as a set, or a tuple when some are unhashable"""
+    try:
+        return frozenset(values)
+    except TypeError:
+        return tuple(values)
+
+
+def field_rule(field_name: str, field_schema: Dict[str, Any]) -> FieldRule:
+    """Resolve one field schema into a FieldRule"""
+    regex_pattern = field_schema.get('regex')
+    enum_values = field_schema.get('enum')
+    return FieldRule(
+        name=field_name,
+        schema=field_schema,
+        required=bool(field_schema.get('required', False)),
+        nullable=bool(field_schema.get('nullable', False)),
+        type=field_schema.get('type'),
+        format=field_schema.get('format'),
+        regex=_compiled_regex(regex_pattern) if regex_pattern is not None else None,
+        enum=_enum_values(enum_values) if enum_values is not None else None,
+    )
+
+
+@lru_cache(maxsize=32)
+def compile_field_rules(schema_json: str) -> Tuple[FieldRule, ...]:
+    """
+    Resolve a serialized schema into validation rules
+    
+    Keyed on the serialized schema, so pipelines with equal schemas share one
+    set of rules; the rules are built from a fresh parse and never alias a
+    caller's (mutable) schema dict.
+    
+    Args:
+        schema_json: Schema serialized with json.dumps
+        
+    Returns:
+        Tuple of FieldRule in schema order
+    """
+    return tuple(
+        field_rule(field_name, field_schema)
+        for field_name, field_schema in json.loads(schema_json).items()
+    )
+
+
+def batched(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """
+    Yield successive lists of at most batch_size items
+    
+    Args:
+        items: Iterable to split into batches
+        batch_size: Maximum number of items per batch
+        
+    Returns:
+        Iterator over lists of items
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _scan_directory(directory: str) -> tuple[List[str], List[str]]:
+    """
+    List the files and subdirectories directly inside a directory
+    
+    Args:
+        directory: Directory path to scan
+        
+    Returns:
+        Tuple of (file_paths, subdirectory_paths); both empty if the
+        directory can't be read
+    """
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # Like Path.rglob, do not descend into symlinked directories
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    files.append(entry.path)
+    except OSError:
+        # Like Path.rglob, skip unreadable directories and ones removed mid-scan
+        return [], []
+    return files, subdirs
+
+
+def iter_files(root: str, max_workers: int = SCAN_MAX_WORKERS) -> Iterator[str]:
+    """
+    Lazily yield all files under a directory, scanning directories concurrently
+    
+    Each worker lists one directory at a time, so several directories are in
+    flight at once; this hides per-directory latency on network mounts. Files
+    are yielded in the same depth-first order as Path.rglob, so repeated runs
+    over an unchanged tree produce the same order.
+    
+    Args:
+        root: Root directory path
+        max_workers: Number of directories scanned concurrently
+        
+    Returns:
+        Iterator over file paths
+    """
+    p = Path(root)
+    if not p.exists() or not p.is_dir():
+        raise ValueError(f"Provided root path '{root}' is not a valid directory.")
+    return _iter_scanned_files(str(p), max(max_workers, 1))
+
+
+def _iter_scanned_files(root: str, max_workers: int) -> Iterator[str]:
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Futures in depth-first order: a directory's subdirectories are
+        # scanned concurrently but consumed right after it, in listing order
+        order = deque([executor.submit(_scan_directory, root)])
+        while order:
+            files, subdirs = order.popleft().result()
+            order.extendleft(
+                reversed([executor.submit(_scan_directory, subdir) for subdir in subdirs])
+            )
+            yield from files
+
+
+def scan_files(root: str, max_workers: int = SCAN_MAX_WORKERS) -> List[str]:
+    """
+    Get all files under a directory recursively, scanning directories concurrently
+    
+    Args:
+        root: Root directory path
+        max_workers: Number of directories scanned concurrently
+        
+    Returns:
+        List of file paths
+    """
+    return list(iter_files(root, max_workers=max_workers))
+
+
 class OCRParsingPipeline:
     """
     Main pipeline class for OCR → Parsing workflow
@@ -30,7 +366,11 @@ class OCRParsingPipeline:
         language_pref: Optional[str] = None,
         schema_version: str = "v1",
         max_retries: int = 2,
-        max_doctags_chars: int = 50000
+        max_doctags_chars: int = 50000,
+        max_concurrency: int = 8,
+        use_cache: bool = False,
+        cache_dir: Optional[str] = None,
+        llm_cache_dir: Optional[str] = None
     ):
         """
         Initialize the pipeline
@@ -43,14 +383,34 @@ class OCRParsingPipeline:
             schema_version: Version of the schema being used
             max_retries: Maximum retry attempts for failed LLM parsing
             max_doctags_chars: Maximum characters to include in parsing prompt
+            max_concurrency: Maximum simultaneous OCR requests, and separately LLM requests
+            use_cache: Reuse OCR output for files already read with the same engine/langs,
+                and LLM answers for prompts already sent to the same model
+            cache_dir: Directory for cached OCR output (default: settings.OCR_CACHE_DIR)
+            llm_cache_dir: Directory for cached LLM answers (default: settings.LLM_CACHE_DIR)
         """
         self.schema = schema
+        # Serialized once per schema and reused in every parsing prompt
+        self.schema_json = json.dumps(schema, indent=2)
+        self.field_rules = compile_field_rules(self.schema_json)
+        self._validation_cache: Dict[Tuple[Any, ...], Tuple[Any, Tuple[str, ...]]] = {}
+        # Parsed LLM output keyed by a digest of the DocTags text; only valid
+        # for the current schema
+        self._parsed_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._parsed_lock = threading.Lock()
         self.ocr_engine = ocr_engine
         self.langs = langs if langs is not None else ["en"]
         self.language_pref = language_pref
         self.schema_version = schema_version
         self.max_retries = max_retries
         self.max_doctags_chars = max_doctags_chars
+        self.max_concurrency = max(max_concurrency, 1)
+        # Separate limits so a slow LLM never holds up OCR slots (and vice versa),
+        # whichever entry point (directory run, batch, webapp) issues the calls
+        self._ocr_slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._llm_slots = threading.BoundedSemaphore(self.max_concurrency)
+        self.ocr_cache = OCRCache(cache_dir) if use_cache else None
+        self.llm_cache = LLMCache(llm_cache_dir) if use_cache else None
     
     def set_ocr_engine(self, ocr_engine: str):
         """
@@ -78,7 +438,25 @@ class OCRParsingPipeline:
             schema: New JSON schema defining required fields and validation rules
         """
         self.schema = schema
+        self.schema_json = json.dumps(schema, indent=2)
+        self.field_rules = compile_field_rules(self.schema_json)
+        self._validation_cache: Dict[Tuple[Any, ...], Tuple[Any, Tuple[str, ...]]] = {}
+        # Parsed LLM output keyed by a digest of the DocTags text; only valid
+        # for the current schema
+        self._parsed_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        
+    def iter_all_files(self, root: str) -> Iterator[str]:
+        """
+        Lazily yield all files from a directory recursively
         
+        Args:
+            root: Root directory path
+            
+        Returns:
+            Iterator over file paths
+        """
+        return iter_files(root)
+    
     def get_all_files(self, root: str) -> List[str]:
         """
         Get all files from a directory recursively
@@ -89,10 +467,7 @@ class OCRParsingPipeline:
         Returns:
             List of file paths
         """
-        p = Path(root)
-        if not p.exists() or not p.is_dir():
-            raise ValueError(f"Provided root path '{root}' is not a valid directory.")
-        return [str(f) for f in p.rglob("*") if f.is_file()]
+        return list(self.iter_all_files(root))
     
     def truncate_doctags(self, doctags_text: str) -> str:
         """
@@ -107,23 +482,41 @@ class OCRParsingPipeline:
         if len(doctags_text) <= self.max_doctags_chars:
             return doctags_text
         
-        # Try to preserve page anchors and key sections
-        lines = doctags_text.split('\n')
-        truncated_lines = []
-        char_count = 0
+        # Try to preserve page anchors and key sections. Leading lines are kept
+        # wholesale up to ~90% of the budget; after that only anchor lines are
+        # added while they fit. Both steps are located with C-level string
+        # searches instead of testing every line in Python.
+        text = doctags_text
+        max_chars = self.max_doctags_chars
+        marker = "\n\n[... content truncated ...]"
+        
+        # Newline ending the last line that starts below the 90% mark, and the
+        # newline ending the last line that fits in the budget
+        prefix_end = text.find('\n', max(math.ceil(max_chars * 0.9) - 1, 0))
+        if prefix_end < 0:
+            prefix_end = len(text)
+        fit_end = text.rfind('\n', 0, max_chars + 1)
+        if fit_end < prefix_end:
+            # Budget runs out while still copying leading lines
+            return text[:max(fit_end, 0)] + marker
         
-        for line in lines:
-            if char_count + len(line) > self.max_doctags_chars:
+        parts = [text[:prefix_end]]
+        char_count = prefix_end + 1
+        pos = prefix_end + 1
+        for anchor in _RE_ANCHOR_LINE.finditer(text, prefix_end):
+            budget = max_chars - char_count
+            # Any line longer than the remaining budget ends truncation
+            skipped = text[pos:anchor.start()]
+            if skipped and max(map(len, skipped.split('\n'))) > budget:
                 break
-            # Always keep page anchors and headers
-            if line.startswith('#') or line.startswith('## Page') or 'Page' in line[:20]:
-                truncated_lines.append(line)
-                char_count += len(line) + 1
-            elif char_count < self.max_doctags_chars * 0.9:  # Keep most content
-                truncated_lines.append(line)
-                char_count += len(line) + 1
+            line = anchor.group(0)[1:]
+            if len(line) > budget:
+                break
+            parts.append(line)
+            char_count += len(line) + 1
+            pos = anchor.end() + 1
         
-        return '\n'.join(truncated_lines) + "\n\n[... content truncated ...]"
+        return '\n'.join(parts) + marker
     
     def build_parsing_prompt(self, doctags_text: str, schema_json: str) -> str:
         """
@@ -155,13 +548,55 @@ class OCRParsingPipeline:
         - The text is read from OCR, so expect some noise and errors. If it is a clear easy fix (e.g. '20/13/2023' -> '2023-12-20'), you may correct it. Otherwise, use the original text with "unsure" tag
 
         DOCTAGS:
-        {doctags_text}
+        {truncated_doctags}
 
         OUTPUT:
         Return a JSON object with EXACT keys from SCHEMA. Must be valid JSON.
         """
         return prompt
     
+    def build_batch_parsing_prompt(self, doctags_texts: List[str], schema_json: str) -> str:
+        """
+        Build one parsing prompt covering several documents
+        
+        Args:
+            doctags_texts: OCR'd texts in DocTags format, one per document
+            schema_json: JSON schema as string
+            
+        Returns:
+            Complete parsing prompt asking for one result per document, in order
+        """
+        documents = "\n\n".join(
+            f"===DOC {index}===\n{doctags_text}"
+            for index, doctags_text in enumerate(doctags_texts, 1)
+        )
+        
+        prompt = f"""SYSTEM:
+        You are a strict information extraction model. Use ONLY the provided DocTags text.
+        Return VALID JSON that matches the given schema. No explanations, no markdown formatting.
+
+        USER:
+        SCHEMA (JSON):
+        {schema_json}
+
+        RULES:
+        - The DOCTAGS below contain {len(doctags_texts)} separate documents, each starting with a "===DOC n===" line.
+        - Extract each document on its own; never copy values between documents.
+        - Fill required fields; if a value is missing/unreadable, use "N/A".
+        - Obey "type", "regex", "enum", and "format" constraints.
+        - For numbers, remove currency symbols and return numeric values only.
+        - Return ONLY JSON, no extra text, no markdown code blocks, no comments.
+        - Extract ONLY what's present in the text. Do NOT invent values.
+        - The text is read from OCR, so expect some noise and errors. If it is a clear easy fix (e.g. '20/13/2023' -> '2023-12-20'), you may correct it. Otherwise, use the original text with "unsure" tag
+
+        DOCTAGS:
+        {documents}
+
+        OUTPUT:
+        Return {{"results": [...]}} where "results" holds exactly {len(doctags_texts)} JSON objects, one per document in DOC order, each with EXACT keys from SCHEMA. Must be valid JSON.
+        """
+        return prompt
+    
     def parse_llm_response(self, response: str) -> Optional[Dict[str, Any]]:
         """
         Parse LLM response to extract JSON
@@ -182,16 +617,30 @@ class OCRParsingPipeline:
             response = response.replace('```json', '').replace('```', '').strip()
         
         try:
-            return json.loads(response)
-        except json.JSONDecodeError:
+            return json_loads(response)
+        except ValueError:
             # Try to find JSON object in the response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                try:
-                    return json.loads(json_match.group(0))
-                except json.JSONDecodeError:
-                    pass
-        return None
+            return extract_json_object(response)
+    
+    def parse_batch_llm_response(self, response: str, count: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Parse a multi-document LLM response into one dict per document
+        
+        Args:
+            response: Raw LLM response
+            count: Number of documents in the prompt
+            
+        Returns:
+            List of count parsed dicts in document order, or None if the shape is wrong
+        """
+        parsed = self.parse_llm_response(response)
+        if isinstance(parsed, dict):
+            parsed = parsed.get('results')
+        if not isinstance(parsed, list) or len(parsed) != count:
+            return None
+        if not all(isinstance(item, dict) for item in parsed):
+            return None
+        return parsed
     
     def validate_field(
         self,
@@ -210,43 +659,44 @@ class OCRParsingPipeline:
         Returns:
             Tuple of (normalized_value, warnings)
         """
-        warnings = []
-        normalized_value = field_value
+        return self.validate_rule(field_rule(field_name, field_schema), field_value)
+    
+    def validate_rule(
+        self,
+        rule: FieldRule,
+        field_value: Any
+    ) -> tuple[Any, List[str]]:
+        """
+        Validate and normalize a single field against its resolved rule
         
-        # Check if field is required
-        is_required = field_schema.get('required', False)
-        is_nullable = field_schema.get('nullable', False)
+        Args:
+            rule: FieldRule resolved from the field schema
+            field_value: Value to validate
+            
+        Returns:
+            Tuple of (normalized_value, warnings)
+        """
+        # Handle missing or N/A values before any type dispatch; only strings
+        # can be empty or N/A, so other types skip the comparisons
+        if field_value is None or (
+            isinstance(field_value, str) and (not field_value or field_value == "N/A")
+        ):
+            if rule.required and not rule.nullable:
+                return "N/A", [f"{rule.name}: required field is missing or N/A"]
+            return "N/A", []
         
-        # Handle missing or N/A values
-        if field_value is None or field_value == "N/A" or field_value == "":
-            if is_required and not is_nullable:
-                warnings.append(f"{field_name}: required field is missing or N/A")
-            normalized_value = "N/A"
-            return normalized_value, warnings
+        field_name = rule.name
+        warnings = []
+        normalized_value = field_value
         
-        field_type = field_schema.get('type')
+        field_type = rule.type
         
         # Type validation and normalization
         if field_type == 'number':
             try:
                 # Remove currency symbols and normalize
                 if isinstance(field_value, str):
-                    # Remove common currency symbols and separators
-                    cleaned = re.sub(r'[^\d.,\-]', '', field_value)
-                    # Handle locale-specific formats (e.g., 1.234,56 -> 1234.56)
-                    if ',' in cleaned and '.' in cleaned:
-                        # Determine which is decimal separator
-                        if cleaned.rindex(',') > cleaned.rindex('.'):
-                            cleaned = cleaned.replace('.', '').replace(',', '.')
-                        else:
-                            cleaned = cleaned.replace(',', '')
-                    elif ',' in cleaned:
-                        # Assume comma is thousands separator unless it's the last 3 chars
-                        if len(cleaned.split(',')[-1]) == 2:
-                            cleaned = cleaned.replace(',', '.')
-                        else:
-                            cleaned = cleaned.replace(',', '')
-                    normalized_value = float(cleaned)
+                    normalized_value = parse_number(field_value)
                 else:
                     normalized_value = float(field_value)
             except (ValueError, AttributeError):
@@ -255,46 +705,69 @@ class OCRParsingPipeline:
         
         elif field_type == 'date':
             # Normalize date to ISO 8601 if format specified
-            date_format = field_schema.get('format')
-            if date_format == 'iso-date' and isinstance(field_value, str):
+            if rule.format == 'iso-date' and isinstance(field_value, str):
                 # Try to parse various date formats
-                date_patterns = [
-                    r'(\d{4})-(\d{2})-(\d{2})',  # ISO format
-                    r'(\d{2})/(\d{2})/(\d{4})',  # DD/MM/YYYY
-                    r'(\d{2})-(\d{2})-(\d{4})',  # DD-MM-YYYY
-                    r'(\d{4})/(\d{2})/(\d{2})',  # YYYY/MM/DD
-                ]
-                
-                normalized = False
-                for pattern in date_patterns:
-                    match = re.search(pattern, field_value)
-                    if match:
-                        groups = match.groups()
-                        if len(groups[0]) == 4:  # Year first
-                            normalized_value = f"{groups[0]}-{groups[1]}-{groups[2]}"
-                        else:  # Day first
-                            normalized_value = f"{groups[2]}-{groups[1]}-{groups[0]}"
-                        normalized = True
-                        break
-                
-                if not normalized:
+                iso_date = normalize_date(field_value)
+                if iso_date is not None:
+                    normalized_value = iso_date
+                else:
                     warnings.append(f"{field_name}: could not normalize date '{field_value}' to ISO format")
+
+        elif field_type == 'string' and rule.format == 'icd-codes':
+            # Keep only well-formed ICD codes, fixing a leading 0 read for O
+            if isinstance(field_value, str):
+                codes = normalize_icd(field_value)
+                if codes:
+                    normalized_value = codes
+                else:
+                    warnings.append(f"{field_name}: no ICD code found in '{field_value}'")
         
         # Regex validation
-        if 'regex' in field_schema:
-            regex_pattern = field_schema['regex']
+        if rule.regex is not None:
             if isinstance(normalized_value, str) and normalized_value != "N/A":
-                if not re.match(regex_pattern, normalized_value):
-                    warnings.append(f"{field_name}: value '{normalized_value}' does not match regex pattern '{regex_pattern}'")
+                if not rule.regex.match(normalized_value):
+                    warnings.append(f"{field_name}: value '{normalized_value}' does not match regex pattern '{rule.regex.pattern}'")
         
         # Enum validation
-        if 'enum' in field_schema:
-            allowed_values = field_schema['enum']
-            if normalized_value not in allowed_values and normalized_value != "N/A":
-                warnings.append(f"{field_name}: value '{normalized_value}' not in allowed enum {allowed_values}")
+        if rule.enum is not None and normalized_value != "N/A":
+            try:
+                allowed = normalized_value in rule.enum
+            except TypeError:  # unhashable value against a set of hashables
+                allowed = False
+            if not allowed:
+                warnings.append(f"{field_name}: value '{normalized_value}' not in allowed enum {rule.schema['enum']}")
         
         return normalized_value, warnings
     
+    def validate_rule_cached(
+        self,
+        rule: FieldRule,
+        field_value: Any
+    ) -> tuple[Any, List[str]]:
+        """
+        validate_rule, memoized for hashable values
+        
+        Documents in a run often repeat values (N/A, common dates, codes), so
+        results are cached per (rule, value type, value) until the schema
+        changes. Unhashable values are validated directly.
+        """
+        key = (id(rule), type(field_value), field_value)
+        try:
+            cached = self._validation_cache.get(key)
+        except TypeError:
+            return self.validate_rule(rule, field_value)
+        if cached is None:
+            normalized_value, warnings = self.validate_rule(rule, field_value)
+            cached = (normalized_value, tuple(warnings))
+            if len(self._validation_cache) >= _VALIDATION_CACHE_SIZE:
+                self._validation_cache.clear()
+            self._validation_cache[key] = cached
+        return cached[0], list(cached[1])
+    
+    def missing_required_fields(self) -> Dict[str, Any]:
+        """Placeholder extraction with every required field set to N/A"""
+        return {rule.name: "N/A" for rule in self.field_rules if rule.required}
+    
     def validate_and_normalize(
         self,
         extracted_data: Dict[str, Any]
@@ -313,26 +786,24 @@ class OCRParsingPipeline:
         confidence = 1.0
         
         # Validate each field in schema
-        for field_name, field_schema in self.schema.items():
+        for rule in self.field_rules:
+            field_name = rule.name
             field_value = extracted_data.get(field_name)
             
             # Handle missing required fields
             if field_value is None:
-                is_required = field_schema.get('required', False)
-                is_nullable = field_schema.get('nullable', False)
-                
-                if is_required and not is_nullable:
+                if rule.required and not rule.nullable:
                     all_warnings.append(f"{field_name}: required field missing in extracted data")
                     normalized_data[field_name] = "N/A"
                     confidence -= 0.1
-                elif is_nullable:
+                elif rule.nullable:
                     normalized_data[field_name] = None
                 else:
                     normalized_data[field_name] = "N/A"
                 continue
             
             # Validate and normalize
-            normalized_value, warnings = self.validate_field(field_name, field_value, field_schema)
+            normalized_value, warnings = self.validate_rule_cached(rule, field_value)
             normalized_data[field_name] = normalized_value
             
             # Update warnings and confidence
@@ -350,94 +821,134 @@ class OCRParsingPipeline:
         
         return normalized_data, all_warnings, confidence
     
-    def parse_document(
+    def ocr_document(
         self,
         file_path: str,
         ocr_engine: Optional[str] = None,
-        ocr_lang: Optional[List[str]] = None
-    ) -> Dict[str, Any]:
+        ocr_lang: Optional[List[str]] = None,
+        content: Optional[bytes] = None
+    ) -> str:
         """
-        Parse a single document through OCR and extraction
+        Run OCR on a single document and return its DocTags text
         
         Args:
             file_path: Path to document file
             ocr_engine: OCR engine to use (default: use instance's ocr_engine)
             ocr_lang: OCR languages (default: use instance's langs)
+            content: Document bytes to send instead of reading file_path from disk;
+                file_path then only names the upload
             
         Returns:
-            Parsed document result
+            DocTags text produced by the OCR service
         """
-        # Use instance defaults if not provided
         if ocr_engine is None:
             ocr_engine = self.ocr_engine
         if ocr_lang is None:
             ocr_lang = self.langs
         
-        warnings = []
-        raw_preview = {}
-        
-        # Step 1: OCR the document
-        try:
-            doctags_text = read_file(
+        with self._ocr_slots:
+            if content is not None:
+                return read_bytes(
+                    content,
+                    os.path.basename(file_path),
+                    to_formats=['doctags'],
+                    ocr_engine=ocr_engine,
+                    ocr_lang=ocr_lang,
+                    force_ocr=True,
+                    cache=self.ocr_cache
+                )
+            return read_file(
                 file_path,
                 to_formats=['doctags'],
                 ocr_engine=ocr_engine,
                 ocr_lang=ocr_lang,
-                force_ocr=True
+                force_ocr=True,
+                cache=self.ocr_cache
             )
-
-            # doctags_text = read_file_mistral(file_path)
-            
-            if not doctags_text or len(doctags_text.strip()) == 0:
-                warnings.append("OCR_EMPTY_OR_FAILED")
-                # Set all required fields to N/A
-                extracted_data = {
-                    field: "N/A"
-                    for field, schema in self.schema.items()
-                    if schema.get('required', False)
-                }
-                return {
-                    "file_path": file_path,
-                    "extracted": extracted_data,
-                    "confidence": 0.0,
-                    "warnings": warnings,
-                    "raw_preview": {"error": "OCR failed or returned empty text"}
-                }
-            
-            # Store preview
-            raw_preview['first_1000_chars'] = doctags_text[:1000]
-            raw_preview['pages_detected'] = doctags_text.count('# Page') + doctags_text.count('## Page')
+    
+    def fill_fixed_fields(
+        self,
+        extracted_data: Dict[str, Any],
+        doctags_text: str,
+        warnings: List[str]
+    ) -> None:
+        """
+        Fill missing fixed-length ID fields (BHXH, CCCD) from a direct text scan
+        
+        Only fields in the schema that the LLM left empty or N/A are filled;
+        values the LLM did return are never overwritten.
+        
+        Args:
+            extracted_data: Parsed LLM output, updated in place
+            doctags_text: OCR'd text in DocTags format
+            warnings: Warning list to record filled fields in
+        """
+        for field_name, value in extract_fixed_fields(doctags_text).items():
+            if field_name not in self.schema:
+                continue
+            if extracted_data.get(field_name) in (None, "", "N/A", "Not Found"):
+                extracted_data[field_name] = value
+                warnings.append(f"TEXT_SCAN_FILL: {field_name} taken from OCR text")
+    
+    @staticmethod
+    def build_raw_preview(doctags_text: str) -> Dict[str, Any]:
+        """Summarize OCR text for the result's raw_preview"""
+        return {
+            'first_1000_chars': doctags_text[:1000],
+            # '## Page' contains '# Page', so one count covers both headings
+            'pages_detected': doctags_text.count('# Page')
+        }
+    
+    def parse_doctags(
+        self,
+        file_path: str,
+        doctags_text: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Extract, validate and score fields from already OCR'd DocTags text
+        
+        Args:
+            file_path: Path of the document the text was read from
+            doctags_text: OCR'd text in DocTags format
             
-        except Exception as e:
-            warnings.append(f"OCR_ERROR: {str(e)}")
-            extracted_data = {
-                field: "N/A"
-                for field, schema in self.schema.items()
-                if schema.get('required', False)
-            }
+        Returns:
+            Parsed document result
+        """
+        warnings = []
+        
+        if not doctags_text or len(doctags_text.strip()) == 0:
+            warnings.append("OCR_EMPTY_OR_FAILED")
+            # Set all required fields to N/A
+            extracted_data = self.missing_required_fields()
             return {
                 "file_path": file_path,
                 "extracted": extracted_data,
                 "confidence": 0.0,
                 "warnings": warnings,
-                "raw_preview": {"error": str(e)}
+                "raw_preview": {"error": "OCR failed or returned empty text"}
             }
         
-        # Step 2: Parse with LLM
-        schema_json = json.dumps(self.schema, indent=2)
-        prompt = self.build_parsing_prompt(doctags_text, schema_json)
+        # Store preview
+        raw_preview = self.build_raw_preview(doctags_text)
+        
+        # Identical text (re-scans, repeated templates) reuses the earlier answer
+        doctags_key = hashlib.blake2b(doctags_text.encode("utf-8"), digest_size=16).digest()
+        parsed_json = self.cached_parse(doctags_key)
+        if parsed_json is not None:
+            return self.finish_parsed(file_path, doctags_text, parsed_json, warnings, raw_preview)
+        
+        # Parse with LLM
+        prompt_parts = [self.build_parsing_prompt(doctags_text, self.schema_json)]
         
-        parsed_json = None
         retry_count = 0
         
         while retry_count <= self.max_retries and parsed_json is None:
             try:
                 if retry_count > 0:
                     # Add stricter instruction for retries
-                    prompt = f"{prompt}\n\nIMPORTANT: Your previous response was invalid. Return ONLY valid JSON, no other text."
+                    prompt_parts.append(RETRY_SUFFIX)
                 
-                llm_response = chat_with_model(prompt)
-                parsed_json = self.parse_llm_response(llm_response)
+                parsed_json = self.ask_llm("".join(prompt_parts), self.parse_llm_response)
                 
                 if parsed_json is None:
                     retry_count += 1
@@ -448,14 +959,82 @@ class OCRParsingPipeline:
                 warnings.append(f"LLM_ERROR: {str(e)}")
                 retry_count += 1
         
+        if isinstance(parsed_json, dict):
+            self.remember_parse(doctags_key, parsed_json)
+        return self.finish_parsed(file_path, doctags_text, parsed_json, warnings, raw_preview)
+    
+    def ask_llm(self, prompt: str, parse: Callable[[str], Optional[_T]]) -> Optional[_T]:
+        """
+        Send a prompt to the LLM and parse the reply, reusing cached replies
+        
+        Only replies that parse are cached, so an invalid answer is never
+        replayed and retries always reach the model.
+        
+        Args:
+            prompt: Prompt text
+            parse: Parser returning None for an unusable reply
+            
+        Returns:
+            Parsed reply, or None if the model's reply did not parse
+        """
+        cache_key = self.llm_cache.make_key(prompt) if self.llm_cache is not None else None
+        if cache_key is not None:
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                parsed = parse(cached)
+                if parsed is not None:
+                    return parsed
+        
+        with self._llm_slots:
+            llm_response = chat_with_model(prompt)
+        parsed = parse(llm_response)
+        if parsed is not None and cache_key is not None:
+            self.llm_cache.set(cache_key, llm_response)
+        return parsed
+    
+    def cached_parse(self, doctags_key: bytes) -> Optional[Dict[str, Any]]:
+        """Copy of the parsed LLM output remembered for a DocTags digest, if any"""
+        with self._parsed_lock:
+            parsed_json = self._parsed_cache.get(doctags_key)
+            if parsed_json is None:
+                return None
+            self._parsed_cache.move_to_end(doctags_key)
+        # finish_parsed fills fields in place, so never hand out the stored dict
+        return dict(parsed_json)
+    
+    def remember_parse(self, doctags_key: bytes, parsed_json: Dict[str, Any]) -> None:
+        """Remember parsed LLM output for a DocTags digest, evicting the oldest"""
+        with self._parsed_lock:
+            self._parsed_cache[doctags_key] = dict(parsed_json)
+            self._parsed_cache.move_to_end(doctags_key)
+            if len(self._parsed_cache) > _PARSED_CACHE_SIZE:
+                self._parsed_cache.popitem(last=False)
+    
+    def finish_parsed(
+        self,
+        file_path: str,
+        doctags_text: str,
+        parsed_json: Optional[Dict[str, Any]],
+        warnings: List[str],
+        raw_preview: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Turn the LLM's parsed JSON for one document into a validated result
+        
+        Args:
+            file_path: Path of the document
+            doctags_text: OCR'd text the fields were extracted from
+            parsed_json: Parsed LLM output, or None if parsing failed
+            warnings: Warnings collected so far, extended in place
+            raw_preview: Preview of the OCR text
+            
+        Returns:
+            Parsed document result
+        """
         # If all retries failed
         if parsed_json is None:
             warnings.append("LLM_PARSING_FAILED: Could not extract valid JSON after retries")
-            extracted_data = {
-                field: "N/A"
-                for field, schema in self.schema.items()
-                if schema.get('required', False)
-            }
+            extracted_data = self.missing_required_fields()
             return {
                 "file_path": file_path,
                 "extracted": extracted_data,
@@ -464,7 +1043,11 @@ class OCRParsingPipeline:
                 "raw_preview": raw_preview
             }
         
-        # Step 3: Validate and normalize
+        # Fill fixed-format IDs the LLM missed straight from the text
+        if isinstance(parsed_json, dict):
+            self.fill_fixed_fields(parsed_json, doctags_text, warnings)
+        
+        # Validate and normalize
         normalized_data, validation_warnings, confidence = self.validate_and_normalize(parsed_json)
         warnings.extend(validation_warnings)
         
@@ -476,13 +1059,276 @@ class OCRParsingPipeline:
             "raw_preview": raw_preview
         }
     
+    def parse_document(
+        self,
+        file_path: str,
+        ocr_engine: Optional[str] = None,
+        ocr_lang: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse a single document through OCR and extraction
+        
+        Args:
+            file_path: Path to document file
+            ocr_engine: OCR engine to use (default: use instance's ocr_engine)
+            ocr_lang: OCR languages (default: use instance's langs)
+            
+        Returns:
+            Parsed document result
+        """
+        # Step 1: OCR the document
+        try:
+            doctags_text = self.ocr_document(file_path, ocr_engine, ocr_lang)
+            # doctags_text = read_file_mistral(file_path)
+        except Exception as e:
+            return self.ocr_error_result(file_path, e)
+        
+        # Step 2 and 3: Parse with LLM, validate and normalize
+        return self.parse_doctags(file_path, doctags_text)
+    
+    def ocr_error_result(self, file_path: str, error: Exception) -> Dict[str, Any]:
+        """
+        Build the result for a document whose OCR request raised
+        
+        Args:
+            file_path: Path to document file
+            error: Exception raised by the OCR step
+            
+        Returns:
+            Parsed document result with zero confidence
+        """
+        extracted_data = self.missing_required_fields()
+        return {
+            "file_path": file_path,
+            "extracted": extracted_data,
+            "confidence": 0.0,
+            "warnings": [f"OCR_ERROR: {str(error)}"],
+            "raw_preview": {"error": str(error)}
+        }
+    
+    def iter_ocr_results(
+        self,
+        file_paths: Iterable[str],
+        ocr_engine: Optional[str] = None,
+        ocr_lang: Optional[List[str]] = None,
+        prefetch: int = 16,
+        contents: Optional[Dict[str, bytes]] = None
+    ) -> Iterator[Tuple[str, Optional[str], Optional[Exception]]]:
+        """
+        OCR files on a thread pool, keeping up to prefetch requests in flight
+        
+        Results are yielded in input order. Because requests for upcoming files
+        are already running, the caller's work on a yielded result (e.g. the LLM
+        step) overlaps with OCR of the files after it.
+        
+        Args:
+            file_paths: Paths to document files
+            ocr_engine: OCR engine to use (default: use instance's ocr_engine)
+            ocr_lang: OCR languages (default: use instance's langs)
+            prefetch: Maximum number of OCR requests in flight
+            contents: In-memory document bytes by file path, sent instead of
+                reading those files from disk
+            
+        Returns:
+            Iterator of (file_path, doctags_text, error) tuples; error is set when OCR raised
+        """
+        prefetch = max(prefetch, 1)
+        if contents is None:
+            contents = {}
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            for file_path in file_paths:
+                in_flight.append((
+                    file_path,
+                    executor.submit(
+                        self.ocr_document, file_path, ocr_engine, ocr_lang,
+                        contents.get(file_path)
+                    )
+                ))
+                if len(in_flight) >= prefetch:
+                    yield self._collect_ocr(*in_flight.popleft())
+            while in_flight:
+                yield self._collect_ocr(*in_flight.popleft())
+    
+    @staticmethod
+    def _collect_ocr(file_path: str, future) -> Tuple[str, Optional[str], Optional[Exception]]:
+        try:
+            return file_path, future.result(), None
+        except Exception as e:
+            return file_path, None, e
+    
+    def _finish_document(
+        self,
+        file_path: str,
+        doctags_text: Optional[str],
+        error: Optional[Exception]
+    ) -> Dict[str, Any]:
+        if error is not None:
+            return self.ocr_error_result(file_path, error)
+        return self.parse_doctags(file_path, doctags_text)
+    
+    def iter_parsed_documents(
+        self,
+        file_paths: Iterable[str],
+        ocr_engine: Optional[str] = None,
+        ocr_lang: Optional[List[str]] = None,
+        max_concurrency: Optional[int] = None,
+        contents: Optional[Dict[str, bytes]] = None
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Parse documents concurrently, yielding each result as soon as it is done
+        
+        Each OCR result is handed to the LLM pool as soon as it arrives, so one
+        slow document never holds up the others and OCR of upcoming files
+        overlaps with extraction of earlier ones.
+        
+        Args:
+            file_paths: Paths to document files
+            ocr_engine: OCR engine to use (default: use instance's ocr_engine)
+            ocr_lang: OCR languages (default: use instance's langs)
+            max_concurrency: Maximum documents being parsed at once (default: instance's max_concurrency)
+            contents: In-memory document bytes by file path, sent instead of
+                reading those files from disk
+            
+        Returns:
+            Iterator of (input index, parsed document result) in completion order
+        """
+        max_concurrency = max(max_concurrency or self.max_concurrency, 1)
+        ocr_results = self.iter_ocr_results(
+            file_paths, ocr_engine, ocr_lang, prefetch=2 * max_concurrency,
+            contents=contents
+        )
+        pending = {}  # future -> input index
+        with ThreadPoolExecutor(max_workers=max_concurrency) as llm_executor:
+            for index, item in enumerate(ocr_results):
+                pending[llm_executor.submit(self._finish_document, *item)] = index
+                if len(pending) >= max_concurrency:
+                    for future in wait(pending, return_when=FIRST_COMPLETED).done:
+                        yield pending.pop(future), future.result()
+            for future in wait(pending).done:
+                yield pending.pop(future), future.result()
+    
+    def parse_documents(
+        self,
+        file_paths: List[str],
+        ocr_engine: Optional[str] = None,
+        ocr_lang: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse a batch of documents, issuing their OCR and LLM requests concurrently
+        
+        Args:
+            file_paths: Paths to document files
+            ocr_engine: OCR engine to use (default: use instance's ocr_engine)
+            ocr_lang: OCR languages (default: use instance's langs)
+            
+        Returns:
+            Parsed document results in the same order as file_paths
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(file_paths)
+        # Bounded by max_concurrency, however many files are passed in
+        for index, doc_result in self.iter_parsed_documents(file_paths, ocr_engine, ocr_lang):
+            results[index] = doc_result
+        return results
+    
+    def parse_documents_batched(
+        self,
+        file_paths: List[str],
+        marshal_k: int = 4,
+        ocr_engine: Optional[str] = None,
+        ocr_lang: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse documents with several small ones sharing each LLM request
+        
+        After OCR, documents are packed greedily into groups of at most marshal_k
+        whose combined text fits in max_doctags_chars, and each group is
+        extracted with a single prompt. Documents too large to share a prompt,
+        and groups whose response can't be split back into one result per
+        document, go through the single-document path instead.
+        
+        Args:
+            file_paths: Paths to document files
+            marshal_k: Maximum documents per LLM request (default: 4)
+            ocr_engine: OCR engine to use (default: use instance's ocr_engine)
+            ocr_lang: OCR languages (default: use instance's langs)
+            
+        Returns:
+            Parsed document results in the same order as file_paths
+        """
+        marshal_k = max(marshal_k, 1)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(file_paths)
+        groups: List[List[Tuple[int, str, str]]] = []
+        group: List[Tuple[int, str, str]] = []
+        group_chars = 0
+        
+        ocr_results = self.iter_ocr_results(
+            file_paths, ocr_engine, ocr_lang, prefetch=self.max_concurrency
+        )
+        for index, (file_path, doctags_text, error) in enumerate(ocr_results):
+            if error is not None or not doctags_text or not doctags_text.strip():
+                # Nothing to send to the LLM
+                results[index] = self._finish_document(file_path, doctags_text, error)
+                continue
+            if len(doctags_text) > self.max_doctags_chars:
+                groups.append([(index, file_path, doctags_text)])
+                continue
+            if group and (len(group) >= marshal_k or group_chars + len(doctags_text) > self.max_doctags_chars):
+                groups.append(group)
+                group, group_chars = [], 0
+            group.append((index, file_path, doctags_text))
+            group_chars += len(doctags_text)
+        if group:
+            groups.append(group)
+        
+        if groups:
+            with ThreadPoolExecutor(max_workers=min(len(groups), self.max_concurrency)) as executor:
+                for group_results in executor.map(self._parse_group, groups):
+                    for index, doc_result in group_results:
+                        results[index] = doc_result
+        
+        return results
+    
+    def _parse_group(
+        self,
+        group: List[Tuple[int, str, str]]
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        if len(group) == 1:
+            index, file_path, doctags_text = group[0]
+            return [(index, self.parse_doctags(file_path, doctags_text))]
+        
+        prompt = self.build_batch_parsing_prompt(
+            [doctags_text for _, _, doctags_text in group], self.schema_json
+        )
+        try:
+            parsed_list = self.ask_llm(
+                prompt, lambda response: self.parse_batch_llm_response(response, len(group))
+            )
+        except Exception:
+            parsed_list = None
+        
+        if parsed_list is None:
+            # Fall back to one request per document
+            return [
+                (index, self.parse_doctags(file_path, doctags_text))
+                for index, file_path, doctags_text in group
+            ]
+        
+        return [
+            (index, self.finish_parsed(
+                file_path, doctags_text, parsed_json, [], self.build_raw_preview(doctags_text)
+            ))
+            for (index, file_path, doctags_text), parsed_json in zip(group, parsed_list)
+        ]
+    
     def process_directory(
         self,
         data_dir: str,
         ocr_engine: Optional[str] = None,
         ocr_lang: Optional[List[str]] = None,
         file_filter: Optional[str] = None,
-        csv_output: str = "result.csv"
+        csv_output: str = "result.csv",
+        max_concurrency: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Process all files in a directory
@@ -493,6 +1339,7 @@ class OCRParsingPipeline:
             ocr_lang: OCR languages (default: use instance's langs)
             file_filter: Optional glob pattern to filter files (e.g., "*.pdf")
             csv_output: Path to CSV output file (default: "result.csv")
+            max_concurrency: Maximum documents being parsed at once (default: instance's max_concurrency)
             
         Returns:
             Complete results with all documents
@@ -502,17 +1349,29 @@ class OCRParsingPipeline:
             ocr_engine = self.ocr_engine
         if ocr_lang is None:
             ocr_lang = self.langs
+        max_concurrency = max(max_concurrency or self.max_concurrency, 1)
         
-        # Get all files
-        all_files = self.get_all_files(data_dir)
+        # Stream files so processing starts before the directory scan finishes
+        all_files = self.iter_all_files(data_dir)
         
-        # Apply filter if specified
-        if file_filter:
-            filtered_files = []
-            for file_path in all_files:
-                if Path(file_path).match(file_filter):
-                    filtered_files.append(file_path)
-            all_files = filtered_files
+        # Apply filter if specified; plain name patterns such as "*.pdf" only
+        # need the basename, so skip building a Path per file
+        if file_filter and '/' not in file_filter:
+            all_files = (
+                file_path for file_path in all_files
+                if fnmatchcase(os.path.basename(file_path), file_filter)
+            )
+        elif file_filter:
+            all_files = (
+                file_path for file_path in all_files
+                if Path(file_path).match(file_filter)
+            )
+        
+        def announce(file_paths: Iterable[str]) -> Iterator[str]:
+            # Progress for CLI runs; printed as each file enters the pipeline
+            for file_path in file_paths:
+                print(f"Processing: {file_path}")
+                yield file_path
         
         # Prepare CSV headers
         csv_headers = ['file_path', 'confidence', 'warnings'] + list(self.schema.keys())
@@ -528,25 +1387,38 @@ class OCRParsingPipeline:
             if not file_exists:
                 writer.writeheader()
             
-            # Process each file
-            documents = []
-            for file_path in all_files:
-                print(f"Processing: {file_path}")
-                doc_result = self.parse_document(file_path, ocr_engine, ocr_lang)
-                documents.append(doc_result)
-                
-                # Prepare CSV row
-                csv_row = {
+            def csv_row(doc_result: Dict[str, Any]) -> Dict[str, Any]:
+                row = {
                     'file_path': doc_result['file_path'],
                     'confidence': doc_result['confidence'],
                     'warnings': '; '.join(doc_result['warnings']) if doc_result['warnings'] else ''
                 }
                 # Add extracted fields
-                csv_row.update(doc_result['extracted'])
-                
-                # Write to CSV
-                writer.writerow(csv_row)
-                csvfile.flush()  # Ensure data is written immediately
+                row.update(doc_result['extracted'])
+                return row
+            
+            # Rows are written as documents finish, so one slow document never
+            # holds up the others. Only this thread touches the CSV writer.
+            results_by_index: Dict[int, Dict[str, Any]] = {}
+            # Flush periodically so a long run's CSV stays readable without a
+            # flush syscall per document; closing the file flushes the rest
+            unflushed_rows = 0
+            last_flush = time.monotonic()
+            
+            for index, doc_result in self.iter_parsed_documents(
+                announce(all_files), ocr_engine, ocr_lang, max_concurrency
+            ):
+                results_by_index[index] = doc_result
+                writer.writerow(csv_row(doc_result))
+                unflushed_rows += 1
+                now = time.monotonic()
+                if unflushed_rows >= _CSV_FLUSH_ROWS or now - last_flush >= _CSV_FLUSH_SECONDS:
+                    csvfile.flush()
+                    unflushed_rows = 0
+                    last_flush = now
+            
+            # Keep the returned documents in input order
+            documents = [results_by_index[index] for index in range(len(results_by_index))]
         
         # Build final result
         result = {
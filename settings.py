@@ -26,13 +26,27 @@ LLM_MODEL = "gpt-oss:120b"
 LLM_API_TIMEOUT = 120
 
 
-# OCR defaults
-DEFAULT_OCR_ENGINE = "easyocr"
-DEFAULT_OCR_LANGS = "en,vi"
+# OCR defaults; the engine runs on the Docling service, so any engine it
+# supports (e.g. "rapidocr") can be selected without code changes
+DEFAULT_OCR_ENGINE = os.getenv("OCR_ENGINE", "easyocr")
+DEFAULT_OCR_LANGS = ("en", "vi")
+
+
+# OCR result cache (used when a pipeline is created with use_cache=True)
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", ".ocr_cache")
+
+# LLM response cache (used alongside the OCR cache when use_cache=True)
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "~/.cache/ocr_llm")
+
+
+# Directory scanning
+SCAN_MAX_WORKERS = int(os.getenv("SCAN_MAX_WORKERS", "16"))
 
 
 # Preview cache
 PREVIEW_MAX_ASSETS = 200
+# Rendered preview pages kept in memory (most recently viewed first)
+PREVIEW_RENDER_CACHE_SIZE = 64
 
 # Optional: customize where preview PDFs are cached. If unset, uses system temp.
 _cache_dir: Optional[str] = "temp"
@@ -6,16 +6,21 @@ using the OCR→Parsing Pipeline.
 """
 
 import streamlit as st
-import tempfile
+import queue
+import threading
 import shutil
 from pathlib import Path
 import json
 from pipeline import OCRParsingPipeline
 from config import BHXH_SCHEMA
+from settings import DEFAULT_OCR_ENGINE, DEFAULT_OCR_LANGS
+from json_utils import dumps_indented
 import pandas as pd
 from io import BytesIO
 import copy
-import subprocess
+import hashlib
+import uuid
+from types import MappingProxyType
 from PyPDF2 import PdfReader, PdfWriter
 
 # Check for PDF preview availability
@@ -23,15 +28,11 @@ PDF_PREVIEW_AVAILABLE = False
 PDF_PREVIEW_ERROR = None
 
 try:
-    from pdf2image import convert_from_bytes
-    # Verify poppler is actually available
-    try:
-        subprocess.run(["pdftoppm", "-v"], capture_output=True, check=True)
-        PDF_PREVIEW_AVAILABLE = True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        PDF_PREVIEW_ERROR = "poppler-utils not found. For deployment, add 'poppler-utils' to packages.txt file."
+    import pymupdf
+    from PIL import Image
+    PDF_PREVIEW_AVAILABLE = True
 except ImportError:
-    PDF_PREVIEW_ERROR = "pdf2image not installed. Add 'pdf2image' to requirements.txt"
+    PDF_PREVIEW_ERROR = "PyMuPDF not installed. Add 'pymupdf' to requirements.txt"
 
 
 # Set page configuration
@@ -42,34 +43,131 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Store default schema
-DEFAULT_SCHEMA = copy.deepcopy(BHXH_SCHEMA)
+# Read-only view of the default schema; sessions edit their own copy
+DEFAULT_SCHEMA = MappingProxyType(BHXH_SCHEMA)
+
+
+def default_schema_copy():
+    """
+    Editable copy of the default schema
+    
+    The editor only adds, removes or replaces whole fields, so copying each
+    field's config one level deep is enough to keep the default untouched.
+    """
+    return {field: dict(config) for field, config in DEFAULT_SCHEMA.items()}
 
 
 def get_current_schema():
     """Get the current schema from session state or default"""
     if 'custom_schema' not in st.session_state:
-        st.session_state.custom_schema = copy.deepcopy(DEFAULT_SCHEMA)
+        st.session_state.custom_schema = default_schema_copy()
     return st.session_state.custom_schema
 
 
 def reset_schema():
     """Reset schema to default"""
-    st.session_state.custom_schema = copy.deepcopy(DEFAULT_SCHEMA)
-    # Update pipeline schema without reinitializing
+    st.session_state.custom_schema = default_schema_copy()
     if 'pipeline' in st.session_state:
-        st.session_state.pipeline.set_schema(st.session_state.custom_schema)
+        refresh_pipeline()
+
+
+# PyMuPDF objects must not be used from several threads at once, and
+# Streamlit runs each session on its own thread
+_PDF_LOCK = threading.Lock()
+
+
+@st.cache_resource(max_entries=8)
+def open_pdf(pdf_bytes: bytes):
+    """Parse a PDF once and keep the open document for later renders"""
+    return pymupdf.open(stream=pdf_bytes, filetype="pdf")
+
+
+# Preview pages are shown in a third of the page width, so render them at
+# roughly that size rather than at print resolution
+PREVIEW_WIDTH = 600
+
+# Default "Parallel Documents" value; also the pipeline's OCR/LLM slot count
+DEFAULT_MAX_CONCURRENCY = 8
+
 
+@st.cache_data(max_entries=32, show_spinner=False)
+def render_pdf_page(pdf_bytes: bytes, page: int, width: int = PREVIEW_WIDTH):
+    """Render one PDF page to an image width pixels wide (cached across reruns)"""
+    doc = open_pdf(pdf_bytes)
+    with _PDF_LOCK:
+        if not 1 <= page <= doc.page_count:
+            return None
+        pdf_page = doc[page - 1]
+        zoom = width / pdf_page.rect.width
+        pix = pdf_page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+        return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
 
-@st.cache_resource
-def initialize_pipeline(_schema):
-    """Initialize the OCR pipeline (cached to avoid re-initialization)"""
+
+def count_pdf_pages(pdf_bytes: bytes) -> int:
+    """Count PDF pages from the already-open document"""
+    doc = open_pdf(pdf_bytes)
+    with _PDF_LOCK:
+        return doc.page_count
+
+
+def schema_signature(schema):
+    """Stable digest of a schema's content, used as a cache key"""
+    schema_json = json.dumps(schema, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(schema_json.encode('utf-8'), digest_size=16).hexdigest()
+
+
+@st.cache_resource(max_entries=16)
+def initialize_pipeline(schema_key, ocr_engine, langs, _schema, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """
+    Initialize the OCR pipeline (cached to avoid re-initialization)
+    
+    Cached pipelines are shared by every session, so they are keyed on the
+    schema signature, engine, languages and concurrency (which sizes the
+    pipeline's OCR/LLM slots) and never mutated afterwards.
+    """
     return OCRParsingPipeline(
-        schema=_schema,
-        ocr_engine="easyocr",
-        langs=["en", "vi"],
-        language_pref="en"
+        schema=copy.deepcopy(_schema),
+        ocr_engine=ocr_engine,
+        langs=list(langs),
+        language_pref="en",
+        max_concurrency=max_concurrency
+    )
+
+
+def refresh_pipeline():
+    """Point the session at the cached pipeline for its current settings"""
+    schema = get_current_schema()
+    ocr_engine = st.session_state.get('ocr_engine', DEFAULT_OCR_ENGINE)
+    langs = tuple(st.session_state.get('ocr_langs', DEFAULT_OCR_LANGS))
+    max_concurrency = st.session_state.get('max_concurrency_input', DEFAULT_MAX_CONCURRENCY)
+    st.session_state.pipeline = initialize_pipeline(
+        schema_signature(schema), ocr_engine, langs, schema, max_concurrency
     )
+    return st.session_state.pipeline
+
+
+def get_schema_stats():
+    """
+    Field count, required count and (emoji, field) rows for the current schema
+    
+    Every schema change switches the session to another cached pipeline, so
+    the result is reused for as long as the session's pipeline stays the same.
+    """
+    pipeline = st.session_state.get('pipeline')
+    cached = st.session_state.get('schema_stats')
+    if pipeline is not None and cached is not None and cached[0] is pipeline:
+        return cached[1]
+    
+    field_rows = []
+    required_count = 0
+    for field, config in get_current_schema().items():
+        required = bool(config.get('required'))
+        required_count += required
+        field_rows.append(("✅" if required else "⭕", field))
+    stats = (len(field_rows), required_count, field_rows)
+    if pipeline is not None:
+        st.session_state.schema_stats = (pipeline, stats)
+    return stats
 
 
 def main():
@@ -82,7 +180,7 @@ def main():
     # Initialize pipeline with current schema
     if 'pipeline' not in st.session_state:
         with st.spinner("Initializing OCR Pipeline..."):
-            st.session_state.pipeline = initialize_pipeline(current_schema)
+            refresh_pipeline()
             st.success("✅ Pipeline initialized successfully!")
     
     # Initialize results storage in session state
@@ -121,16 +219,14 @@ def main():
         
         # Show current schema info
         st.subheader("📋 Current Schema")
-        st.caption(f"Total Fields: {len(current_schema)}")
-        required_count = sum(1 for f in current_schema.values() if f.get('required'))
+        total_count, required_count, field_rows = get_schema_stats()
+        st.caption(f"Total Fields: {total_count}")
         st.caption(f"✅ Required: {required_count}")
-        st.caption(f"⭕ Optional: {len(current_schema) - required_count}")
+        st.caption(f"⭕ Optional: {total_count - required_count}")
         
         # Show field list
         with st.expander("View All Fields"):
-            for field in current_schema.keys():
-                required = current_schema[field].get('required', False)
-                emoji = "✅" if required else "⭕"
+            for emoji, field in field_rows:
                 st.text(f"{emoji} {field}")
         
         st.markdown("---")
@@ -142,7 +238,7 @@ def main():
         with col1:
             if st.button("🔄 Reset", use_container_width=True, help="Reset to default schema"):
                 reset_schema()
-                st.session_state.json_editor_text = json.dumps(DEFAULT_SCHEMA, indent=2, ensure_ascii=False)
+                st.session_state.json_editor_dirty = True
                 st.success("Schema reset!")
                 st.rerun()
         
@@ -187,9 +283,10 @@ def schema_editor_page():
         st.subheader("💻 JSON Editor")
         st.caption("Edit the schema directly as JSON")
         
-        # Initialize JSON editor state
-        if 'json_editor_text' not in st.session_state:
+        # Serialize the schema only when this editor is shown and it changed
+        if st.session_state.get('json_editor_dirty', True) or 'json_editor_text' not in st.session_state:
             st.session_state.json_editor_text = json.dumps(current_schema, indent=2, ensure_ascii=False)
+            st.session_state.json_editor_dirty = False
         
         # Text area for JSON editing
         json_text = st.text_area(
@@ -214,10 +311,10 @@ def schema_editor_page():
                     else:
                         # Apply the new schema
                         st.session_state.custom_schema = new_schema
-                        st.session_state.json_editor_text = json.dumps(new_schema, indent=2, ensure_ascii=False)
+                        st.session_state.json_editor_dirty = True
                         
-                        # Update pipeline schema without reinitializing
-                        st.session_state.pipeline.set_schema(new_schema)
+                        # Switch to the pipeline cached for this schema
+                        refresh_pipeline()
                         st.success("✅ Schema applied successfully!")
                         st.rerun()
                         
@@ -228,7 +325,7 @@ def schema_editor_page():
         
         with col2:
             if st.button("🔄 Reload", use_container_width=True):
-                st.session_state.json_editor_text = json.dumps(current_schema, indent=2, ensure_ascii=False)
+                st.session_state.json_editor_dirty = True
                 st.rerun()
         
         st.markdown("---")
@@ -272,10 +369,10 @@ def schema_editor_page():
                             
                             current_schema[new_field_name] = field_config
                             st.session_state.custom_schema = current_schema
-                            # Update JSON editor text
-                            st.session_state.json_editor_text = json.dumps(current_schema, indent=2, ensure_ascii=False)
-                            # Update pipeline schema without reinitializing
-                            st.session_state.pipeline.set_schema(current_schema)
+                            # JSON editor text is refreshed when next shown
+                            st.session_state.json_editor_dirty = True
+                            # Switch to the pipeline cached for this schema
+                            refresh_pipeline()
                             st.session_state.show_add_field = False
                             st.success(f"Added field: {new_field_name}")
                             st.rerun()
@@ -310,10 +407,10 @@ def schema_editor_page():
             for field in fields_to_delete:
                 del current_schema[field]
             st.session_state.custom_schema = current_schema
-            # Update JSON editor text
-            st.session_state.json_editor_text = json.dumps(current_schema, indent=2, ensure_ascii=False)
-            # Update pipeline schema without reinitializing
-            st.session_state.pipeline.set_schema(current_schema)
+            # JSON editor text is refreshed when next shown
+            st.session_state.json_editor_dirty = True
+            # Switch to the pipeline cached for this schema
+            refresh_pipeline()
             st.success(f"Deleted {len(fields_to_delete)} field(s)")
             st.rerun()
     
@@ -326,7 +423,7 @@ def schema_editor_page():
     with col1:
         if st.button("� Reset", use_container_width=True, help="Reset to default schema"):
             reset_schema()
-            st.session_state.json_editor_text = json.dumps(DEFAULT_SCHEMA, indent=2, ensure_ascii=False)
+            st.session_state.json_editor_dirty = True
             st.success("Schema reset!")
             st.rerun()
     
@@ -351,9 +448,9 @@ def schema_editor_page():
             imported_schema = json.load(uploaded_schema)
             if st.button("✅ Apply Imported Schema", use_container_width=True, type="primary"):
                 st.session_state.custom_schema = imported_schema
-                st.session_state.json_editor_text = json.dumps(imported_schema, indent=2, ensure_ascii=False)
-                # Update pipeline schema without reinitializing
-                st.session_state.pipeline.set_schema(imported_schema)
+                st.session_state.json_editor_dirty = True
+                # Switch to the pipeline cached for this schema
+                refresh_pipeline()
                 st.success("Schema imported!")
                 st.rerun()
         except Exception as e:
@@ -361,51 +458,212 @@ def schema_editor_page():
     
     # Show field count
     st.markdown("---")
-    st.caption(f"📊 Total Fields: {len(current_schema)}")
-    required_count = sum(1 for f in current_schema.values() if f.get('required'))
-    st.caption(f"✅ Required: {required_count} | ⭕ Optional: {len(current_schema) - required_count}")
+    total_count, required_count, _ = get_schema_stats()
+    st.caption(f"📊 Total Fields: {total_count}")
+    st.caption(f"✅ Required: {required_count} | ⭕ Optional: {total_count - required_count}")
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def excel_download(results_id, _df):
+    """Excel bytes for a set of results, built once per results_id"""
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        _df.to_excel(writer, index=False, sheet_name='OCR Results')
+    return buffer.getvalue()
+
 
+@st.cache_data(max_entries=8, show_spinner=False)
+def csv_download(results_id, _df):
+    """CSV bytes (UTF-8 with BOM) for a set of results, built once per results_id"""
+    # BOM (Byte Order Mark) helps Excel recognize UTF-8 encoding; pandas
+    # writes it first and encodes straight into the buffer
+    buffer = BytesIO()
+    _df.to_csv(buffer, index=False, encoding='utf-8-sig')
+    return buffer.getvalue()
 
-def split_pdf_pages(pdf_path: Path, output_dir: Path) -> list[Path]:
+
+def split_pdf_pages(file_name: str, pdf_bytes: bytes) -> list[tuple[str, bytes]]:
     """
-    Split a multi-page PDF into individual page PDFs.
+    Split a multi-page PDF into individual page PDFs, in memory.
     
     Args:
-        pdf_path: Path to the input PDF
-        output_dir: Directory to save split pages
+        file_name: Name of the uploaded PDF
+        pdf_bytes: Contents of the uploaded PDF
     
     Returns:
-        List of paths to the split page PDFs
+        List of (page file name, page PDF bytes)
     """
     split_files = []
     
     try:
-        reader = PdfReader(pdf_path)
+        reader = PdfReader(BytesIO(pdf_bytes))
         num_pages = len(reader.pages)
         
         # If only one page, return original file
         if num_pages == 1:
-            return [pdf_path]
+            return [(file_name, pdf_bytes)]
         
         # Split each page
-        base_name = pdf_path.stem
+        base_name = Path(file_name).stem
         for page_num in range(num_pages):
             writer = PdfWriter()
             writer.add_page(reader.pages[page_num])
             
-            # Create output filename: original_name_page_1.pdf, original_name_page_2.pdf, etc.
-            output_path = output_dir / f"{base_name}_page_{page_num + 1}.pdf"
-            
-            with open(output_path, 'wb') as output_file:
-                writer.write(output_file)
-            
-            split_files.append(output_path)
+            # Page names: original_name_page_1.pdf, original_name_page_2.pdf, etc.
+            output = BytesIO()
+            writer.write(output)
+            split_files.append((f"{base_name}_page_{page_num + 1}.pdf", output.getvalue()))
         
         return split_files
     
     except Exception as e:
-        st.warning(f"Error splitting {pdf_path.name}: {str(e)}. Processing as single file.")
-        return [pdf_path]
+        st.warning(f"Error splitting {file_name}: {str(e)}. Processing as single file.")
+        return [(file_name, pdf_bytes)]
+
+
+def run_parse_job(job, pipeline, files_to_process, contents, csv_headers, max_concurrency):
+    """
+    Parse pages on a background thread, queueing each result as it finishes
+    
+    Runs without a Streamlit script context, so it never calls st.*; the
+    parse_job_progress fragment drains the queue and updates the page.
+    """
+    try:
+        # Parse all pages in one pipeline call; OCR and LLM requests
+        # for different pages overlap and results arrive as they finish
+        parsed = pipeline.iter_parsed_documents(
+            files_to_process,
+            max_concurrency=max_concurrency,
+            contents=contents
+        )
+        for idx, doc_result in parsed:
+            # Prepare table row
+            csv_row = {
+                'file_path': doc_result['file_path'],
+                'confidence': doc_result['confidence'],
+                'warnings': '; '.join(doc_result['warnings']) if doc_result['warnings'] else ''
+            }
+            # Add extracted fields
+            for field in csv_headers[3:]:
+                csv_row[field] = doc_result['extracted'].get(field, '')
+            
+            job['queue'].put((idx, doc_result, csv_row))
+    except Exception as e:
+        job['error'] = e
+    finally:
+        # Sentinel: no more results
+        job['queue'].put(None)
+
+
+def start_parse_job(files_to_process, contents, max_concurrency):
+    """Start parsing in-memory pages in the background and track the job in session state"""
+    # The slider value is only known after the pipeline was first picked this
+    # run; re-pick so the pipeline's OCR/LLM slots match max_concurrency
+    pipeline = refresh_pipeline()
+    current_schema = get_current_schema()
+    csv_headers = ['file_path', 'confidence', 'warnings'] + list(current_schema.keys())
+    
+    job = {
+        'queue': queue.Queue(),
+        'pipeline': pipeline,
+        'csv_headers': csv_headers,
+        'file_names': files_to_process,
+        'results_by_index': {},
+        'rows_by_index': {},
+        # Preview rows are filled in place as pages finish; "string" dtype keeps
+        # values as shown in the CSV without a per-update astype pass
+        'preview_df': pd.DataFrame(
+            index=range(len(files_to_process)), columns=csv_headers, dtype="string"
+        ),
+        'finished': False,
+        'error': None,
+    }
+    job['thread'] = threading.Thread(
+        target=run_parse_job,
+        args=(job, pipeline, files_to_process, contents, csv_headers, max_concurrency),
+        daemon=True
+    )
+    st.session_state.parse_job = job
+    job['thread'].start()
+
+
+@st.fragment(run_every=0.5)
+def parse_job_progress():
+    """Show live progress of the background parse job and collect its results"""
+    job = st.session_state.get('parse_job')
+    if job is None:
+        return
+    
+    total = len(job['file_names'])
+    last_name = None
+    while True:
+        try:
+            item = job['queue'].get_nowait()
+        except queue.Empty:
+            break
+        if item is None:
+            job['finished'] = True
+            break
+        idx, doc_result, csv_row = item
+        job['results_by_index'][idx] = doc_result
+        job['rows_by_index'][idx] = csv_row
+        job['preview_df'].iloc[idx] = [str(value) for value in csv_row.values()]
+        last_name = job['file_names'][idx]
+    
+    if not job['finished']:
+        done_count = len(job['rows_by_index'])
+        st.info("🔄 Processing documents with OCR Pipeline...")
+        if last_name is not None:
+            st.text(f"📄 Processed ({done_count}/{total}): {last_name}")
+        else:
+            st.text(f"📄 Processing {total} page(s)...")
+        st.progress(done_count / total if total else 1.0)
+        
+        # Update the preview table
+        st.subheader("📊 Live Preview")
+        if job['rows_by_index']:
+            st.caption(f"✅ Processed {done_count}/{total} page(s)")
+            preview_df = job['preview_df']
+            st.dataframe(preview_df[preview_df['file_path'].notna()], use_container_width=True)
+        return
+    
+    del st.session_state.parse_job
+    try:
+        if job['error'] is not None:
+            st.session_state.parse_error = job['error']
+        else:
+            # Keep documents in upload order
+            results_by_index = job['results_by_index']
+            rows_by_index = job['rows_by_index']
+            documents = [results_by_index[idx] for idx in range(len(results_by_index))]
+            pipeline = job['pipeline']
+            
+            # Build final result
+            st.session_state.results = {
+                "documents": documents,
+                "meta": {
+                    "language": pipeline.language_pref or "auto-detect",
+                    "schema_version": pipeline.schema_version,
+                    "parsing_strategy": "few-shot",
+                    "total_files": len(documents),
+                    "notes": []
+                }
+            }
+            
+            # Build the results table straight from the rows; CSV is only
+            # written when downloaded
+            # New id so cached downloads of earlier results are not reused
+            st.session_state.results_id = uuid.uuid4().hex
+            st.session_state.df = pd.DataFrame(
+                [rows_by_index[idx] for idx in range(len(rows_by_index))],
+                columns=job['csv_headers'],
+                dtype="string"
+            )
+    except Exception as e:
+        st.session_state.parse_error = e
+    
+    # Redraw the whole page with the results
+    st.rerun()
 
 
 def document_processing_tab():
@@ -446,7 +704,8 @@ def document_processing_tab():
         )
         # Update pipeline OCR engine when changed
         if 'pipeline' in st.session_state and ocr_engine != st.session_state.pipeline.ocr_engine:
-            st.session_state.pipeline.set_ocr_engine(ocr_engine)
+            st.session_state.ocr_engine = ocr_engine
+            refresh_pipeline()
     
     with col2:
         # Get current languages from pipeline, or use default
@@ -468,162 +727,60 @@ def document_processing_tab():
             
             # Update pipeline languages when changed
             if 'pipeline' in st.session_state and ocr_languages != st.session_state.pipeline.langs:
-                st.session_state.pipeline.set_langs(ocr_languages)
+                st.session_state.ocr_langs = ocr_languages
+                refresh_pipeline()
         else:
             ocr_languages = ["en"]  # Default fallback
     
+    # Documents in flight at once; OCR and LLM run on remote services, so this
+    # bounds outstanding requests rather than local cores
+    max_concurrency = st.slider(
+        "Parallel Documents",
+        min_value=1,
+        max_value=32,
+        value=DEFAULT_MAX_CONCURRENCY,
+        help="How many pages are OCR'd and parsed at the same time",
+        key="max_concurrency_input"
+    )
+    
     # Process button
     process_button = st.button(
         "🚀 Parse Documents",
         type="primary",
-        disabled=not uploaded_files,
+        disabled=not uploaded_files or 'parse_job' in st.session_state,
         use_container_width=True
     )
     
     if process_button and uploaded_files:
-        # Create temporary directory for uploaded files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Save uploaded files to temporary directory
-            st.info("💾 Saving uploaded files...")
-            progress_bar = st.progress(0)
-            
-            for i, uploaded_file in enumerate(uploaded_files):
-                file_path = temp_path / uploaded_file.name
-                with open(file_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-                progress_bar.progress((i + 1) / len(uploaded_files))
-            
-            st.success(f"✅ Saved {len(uploaded_files)} file(s)")
-            
-            # Split multi-page PDFs
-            st.info("📄 Checking for multi-page PDFs...")
-            split_dir = temp_path / "split_pages"
-            split_dir.mkdir(exist_ok=True)
-            
-            all_pdf_files = list(temp_path.glob("*.pdf"))
-            files_to_process = []
-            
-            split_progress = st.progress(0)
-            for i, pdf_file in enumerate(all_pdf_files):
-                split_files = split_pdf_pages(pdf_file, split_dir)
-                files_to_process.extend(split_files)
-                split_progress.progress((i + 1) / len(all_pdf_files))
-            
-            split_progress.empty()
-            
-            if len(files_to_process) > len(all_pdf_files):
-                st.success(f"✅ Split into {len(files_to_process)} page(s) from {len(all_pdf_files)} file(s)")
-            
-            # Store split PDF data in session state for preview
-            st.session_state.uploaded_files_data = {}
-            for pdf_file in files_to_process:
-                with open(pdf_file, 'rb') as f:
-                    st.session_state.uploaded_files_data[pdf_file.name] = f.read()
-            
-            # Process documents one by one with live updates
-            st.info("🔄 Processing documents with OCR Pipeline...")
-            
-            try:
-                # Create a temporary CSV file
-                csv_output = temp_path / "results.csv"
-                
-                # Get current schema
-                current_schema = get_current_schema()
-                
-                # Prepare CSV headers
-                csv_headers = ['file_path', 'confidence', 'warnings'] + list(current_schema.keys())
-                
-                # Initialize results storage
-                documents = []
-                processed_data = []
-                
-                # Create placeholders for live updates
-                progress_container = st.container()
-                status_text = st.empty()
-                process_progress = st.progress(0)
-                
-                # Create preview section with placeholder
-                st.subheader("📊 Live Preview")
-                preview_placeholder = st.empty()
-                
-                with progress_container:
-                    pass
-                
-                # Open CSV file for writing
-                with open(csv_output, 'w', newline='', encoding='utf-8') as csvfile:
-                    import csv
-                    writer = csv.DictWriter(csvfile, fieldnames=csv_headers)
-                    writer.writeheader()
-                    
-                    # Process each file
-                    for idx, file_path in enumerate(files_to_process):
-                        file_name = file_path.name
-                        
-                        # Update status
-                        status_text.text(f"📄 Processing ({idx + 1}/{len(files_to_process)}): {file_name}")
-                        
-                        # Process the document
-                        doc_result = st.session_state.pipeline.parse_document(str(file_path))
-                        documents.append(doc_result)
-                        
-                        # Prepare CSV row
-                        csv_row = {
-                            'file_path': doc_result['file_path'],
-                            'confidence': doc_result['confidence'],
-                            'warnings': '; '.join(doc_result['warnings']) if doc_result['warnings'] else ''
-                        }
-                        # Add extracted fields
-                        for field in current_schema.keys():
-                            csv_row[field] = doc_result['extracted'].get(field, '')
-                        processed_data.append(csv_row)
-                        
-                        # Write to CSV
-                        writer.writerow(csv_row)
-                        csvfile.flush()
-                        
-                        # Update progress
-                        process_progress.progress((idx + 1) / len(files_to_process))
-                        
-                        # Update the preview table
-                        with preview_placeholder.container():
-                            st.caption(f"✅ Processed {len(processed_data)}/{len(files_to_process)} page(s)")
-                            preview_df = pd.DataFrame(processed_data)
-                            for col in preview_df.columns:
-                                preview_df[col] = preview_df[col].astype(str)
-                            st.dataframe(preview_df, use_container_width=True)
-                
-                # Clear processing status and live preview
-                status_text.empty()
-                process_progress.empty()
-                preview_placeholder.empty()
-                
-                # Build final result
-                results = {
-                    "documents": documents,
-                    "meta": {
-                        "language": st.session_state.pipeline.language_pref or "auto-detect",
-                        "schema_version": st.session_state.pipeline.schema_version,
-                        "parsing_strategy": "few-shot",
-                        "total_files": len(documents),
-                        "csv_output": str(csv_output),
-                        "notes": []
-                    }
-                }
-                
-                # Display results
-                st.success(f"✅ Successfully processed {results['meta']['total_files']} page(s)!")
-                
-                # Store results in session state
-                st.session_state.results = results
-                
-                # Read the CSV file
-                st.session_state.df = pd.read_csv(csv_output, dtype=str)
-                
-            except Exception as e:
-                st.error(f"❌ Error processing documents: {str(e)}")
-                st.exception(e)
+        # Split multi-page PDFs straight from the uploaded bytes
+        st.info("📄 Checking for multi-page PDFs...")
+        pages = []
+        
+        split_progress = st.progress(0)
+        for i, uploaded_file in enumerate(uploaded_files):
+            pages.extend(split_pdf_pages(uploaded_file.name, uploaded_file.getvalue()))
+            split_progress.progress((i + 1) / len(uploaded_files))
+        
+        split_progress.empty()
+        
+        if len(pages) > len(uploaded_files):
+            st.success(f"✅ Split into {len(pages)} page(s) from {len(uploaded_files)} file(s)")
+        
+        # Page bytes are sent to OCR from memory and kept for the preview
+        st.session_state.uploaded_files_data = dict(pages)
+        files_to_process = [page_name for page_name, _ in pages]
+        
+        start_parse_job(files_to_process, st.session_state.uploaded_files_data, max_concurrency)
+    
+    # Only rendered (and so only polling) while a parse job is running; the
+    # fragment's final st.rerun() drops it again once the job is collected
+    if st.session_state.get('parse_job') is not None:
+        parse_job_progress()
+    
+    parse_error = st.session_state.pop('parse_error', None)
+    if parse_error is not None:
+        st.error(f"❌ Error processing documents: {str(parse_error)}")
+        st.exception(parse_error)
     
     # Display results section (outside the button conditional so it persists)
     if st.session_state.results is not None and st.session_state.df is not None:
@@ -687,15 +844,11 @@ def document_processing_tab():
                 if 'uploaded_files_data' in st.session_state and file_name in st.session_state.uploaded_files_data:
                     if PDF_PREVIEW_AVAILABLE:
                         try:
-                            # Convert PDF to image
                             pdf_bytes = st.session_state.uploaded_files_data[file_name]
-                            images = convert_from_bytes(pdf_bytes, first_page=1, last_page=1, dpi=150)
-                            
-                            if images:
-                                st.image(images[0], use_container_width=True, caption="Page 1")
                             
-                            # Show page count
-                            total_pages = len(convert_from_bytes(pdf_bytes, dpi=72))
+                            # Page count comes from metadata; only the page shown is rendered
+                            total_pages = count_pdf_pages(pdf_bytes)
+                            page_num = 1
                             if total_pages > 1:
                                 st.caption(f"📄 Total pages: {total_pages}")
                                 
@@ -707,29 +860,25 @@ def document_processing_tab():
                                     value=1,
                                     key=f"page_selector_{selected_row_idx}"
                                 )
-                                
-                                if page_num > 1:
-                                    page_images = convert_from_bytes(
-                                        pdf_bytes,
-                                        first_page=page_num,
-                                        last_page=page_num,
-                                        dpi=150
-                                    )
-                                    if page_images:
-                                        st.image(page_images[0], use_container_width=True, caption=f"Page {page_num}")
+                            
+                            # Convert the selected page to an image
+                            page_image = render_pdf_page(pdf_bytes, page_num)
+                            if page_image is not None:
+                                st.image(
+                                    page_image,
+                                    use_container_width=True,
+                                    caption=f"Page {page_num}",
+                                    output_format="JPEG"
+                                )
                         except Exception as e:
                             st.error(f"Error rendering PDF: {str(e)}")
                             if PDF_PREVIEW_ERROR:
                                 st.warning(f"⚠️ {PDF_PREVIEW_ERROR}")
-                            else:
-                                st.info("💡 For local: `pip install pdf2image` and `brew install poppler`")
-                            st.info("📦 For deployment: Add 'poppler-utils' to packages.txt file")
                     else:
                         st.warning("📦 PDF preview not available")
                         if PDF_PREVIEW_ERROR:
                             st.warning(f"⚠️ {PDF_PREVIEW_ERROR}")
-                        st.info("**For local development:**\n```bash\npip install pdf2image\nbrew install poppler  # macOS\n```")
-                        st.info("**For deployment (Streamlit Cloud):**\nCreate `packages.txt` with: `poppler-utils`")
+                        st.info("**To enable previews:**\n```bash\npip install pymupdf\n```")
                 else:
                     st.info("File data not available for preview")
             else:
@@ -741,11 +890,9 @@ def document_processing_tab():
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            # Download Excel file (recommended for Vietnamese characters)
-            buffer = BytesIO()
-            with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='OCR Results')
-            excel_data = buffer.getvalue()
+            # Download Excel file (recommended for Vietnamese characters);
+            # encoded once per results rather than on every rerun
+            excel_data = excel_download(st.session_state.results_id, df)
             
             st.download_button(
                 label="📥 Download Excel (.xlsx)",
@@ -759,10 +906,7 @@ def document_processing_tab():
         
         with col2:
             # Download CSV with UTF-8 BOM for Excel compatibility
-            # BOM (Byte Order Mark) helps Excel recognize UTF-8 encoding
-            csv_string = df.to_csv(index=False)
-            csv_data = '\ufeff' + csv_string  # Add BOM character
-            csv_bytes = csv_data.encode('utf-8')
+            csv_bytes = csv_download(st.session_state.results_id, df)
             st.download_button(
                 label="📥 Download CSV (.csv)",
                 data=csv_bytes,
@@ -774,7 +918,7 @@ def document_processing_tab():
         
         with col3:
             # Download JSON
-            json_data = json.dumps(results, indent=2, ensure_ascii=False).encode('utf-8')
+            json_data = dumps_indented(results)
             st.download_button(
                 label="📥 Download JSON (.json)",
                 data=json_data,
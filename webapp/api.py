@@ -5,17 +5,36 @@ API router definitions for OCR processing, schema management, and downloads.
 from __future__ import annotations
 
 import asyncio
-import json
-from io import BytesIO
+import csv
+import functools
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
 import pandas as pd
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile, Request, Query
-from fastapi.responses import JSONResponse, Response, StreamingResponse, FileResponse
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
 from pdf2image import convert_from_path
 
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Response class for every JSON endpoint (and the app default). ORJSONResponse
+# when orjson is installed; the stdlib JSONResponse fallback differs in that it
+# rejects NaN and cannot encode datetimes, which these payloads do not contain
+DEFAULT_RESPONSE = ORJSONResponse if orjson is not None else JSONResponse
+
 from .state import (
     PDF_PREVIEW_AVAILABLE,
     PDF_PREVIEW_ERROR,
@@ -33,17 +52,26 @@ from .jobs import (
     rollback_job_page,
 )
 from .results import (
+    BASE_COLUMNS,
     build_table_rows,
     calculate_summary,
     build_csv_rows,
     build_dataframe,
     build_meta_from_pipeline,
 )
-from settings import PREVIEW_MAX_ASSETS
+from json_utils import dumps_indented, loads
+from settings import DEFAULT_OCR_ENGINE, PREVIEW_MAX_ASSETS, PREVIEW_RENDER_CACHE_SIZE
 from .pdf_utils import CACHE_DIR
 
 api_router = APIRouter()
 
+# Poppler renders run here so they never block the event loop
+_preview_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pdf-preview")
+# Background warm-up uses at most half the pool so on-demand previews keep running
+_WARM_CONCURRENCY = 2
+# Strong references to running warm-up tasks (the loop only keeps weak ones)
+_warm_tasks: Set[asyncio.Task] = set()
+
 
 class SchemaFieldPayload(BaseModel):
     """Payload for adding a schema field via the API."""
@@ -110,14 +138,14 @@ class SessionEndPayload(BaseModel):
 
 @api_router.get("/schema")
 async def get_schema() -> JSONResponse:
-    return JSONResponse({"schema": state.get_schema()})
+    return DEFAULT_RESPONSE({"schema": state.get_schema()})
 
 
 @api_router.post("/schema/reset")
 async def reset_schema() -> JSONResponse:
     async with state.lock:
         schema = state.reset_schema()
-    return JSONResponse({"schema": schema})
+    return DEFAULT_RESPONSE({"schema": schema})
 
 
 @api_router.post("/schema/set")
@@ -127,7 +155,7 @@ async def set_schema(payload: SchemaApplyPayload) -> JSONResponse:
             schema = state.apply_schema(payload.schema_definition)
         except Exception as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
-    return JSONResponse({"schema": schema})
+    return DEFAULT_RESPONSE({"schema": schema})
 
 
 @api_router.post("/schema/fields")
@@ -137,7 +165,7 @@ async def add_schema_field(payload: SchemaFieldPayload) -> JSONResponse:
             schema = state.add_field(payload.model_dump())
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
-    return JSONResponse({"schema": schema})
+    return DEFAULT_RESPONSE({"schema": schema})
 
 
 @api_router.delete("/schema/fields/{field_name}")
@@ -147,17 +175,31 @@ async def delete_schema_field(field_name: str) -> JSONResponse:
             schema = state.delete_field(field_name)
         except ValueError as exc:
             raise HTTPException(status_code=404, detail=str(exc)) from exc
-    return JSONResponse({"schema": schema})
+    return DEFAULT_RESPONSE({"schema": schema})
+
+
+def _upload_size(upload: UploadFile) -> int:
+    upload.file.seek(0, 2)
+    size = upload.file.tell()
+    upload.file.seek(0)
+    return size
 
 
 @api_router.post("/process")
 async def process_documents(
     append: bool = Form(False),
-    ocr_engine: str = Form("easyocr"),
+    ocr_engine: str = Form(DEFAULT_OCR_ENGINE),
     ocr_languages: str = Form("en,vi"),
     session_id: Optional[str] = Form(None, alias="sessionId"),
+    summary_only: bool = Form(False, alias="summaryOnly"),
     files: List[UploadFile] = File(...),
 ) -> JSONResponse:
+    """Process uploaded PDFs in one request.
+
+    summaryOnly is opt-in for API clients: the response then omits the table,
+    which is fetched in slices from /results/table. The bundled web UI uploads
+    through /process/split-init and /process/split-next and does not use it.
+    """
     if not files:
         raise HTTPException(status_code=400, detail="No files uploaded.")
 
@@ -169,67 +211,82 @@ async def process_documents(
                 status_code=400,
                 detail=f"File '{filename}' is not a PDF document.",
             )
-        data = await upload.read()
-        if not data:
+        # The upload is already spooled by Starlette; hand the file on
+        # instead of reading it into memory
+        if not _upload_size(upload):
             raise HTTPException(
                 status_code=400,
                 detail=f"File '{filename}' is empty.",
             )
-        uploaded_payload.append({"name": filename, "data": data})
+        uploaded_payload.append({"name": filename, "file": upload.file})
 
     langs = parse_languages(ocr_languages)
 
+    loop = asyncio.get_running_loop()
+    progress_tokens: Set[str] = set()
+
+    def handle_preview_asset(token: str, asset: PreviewAsset) -> None:
+        progress_tokens.add(token)
+
+        def _apply() -> None:
+            # Shielded from other requests' result resets until this one merges
+            state.inflight_preview_tokens.add(token)
+            try:
+                state.track_preview_asset(token, asset, session_id=session_id)
+            except Exception:
+                pass
+
+        loop.call_soon_threadsafe(_apply)
+
+    # OCR runs on a pipeline snapshot so the lock only guards reading the
+    # schema and merging the results, not the processing itself
     async with state.lock:
-        loop = asyncio.get_running_loop()
-        progress_tokens: Set[str] = set()
+        request_pipeline = state.snapshot_pipeline(ocr_engine, langs)
 
-        def handle_preview_asset(token: str, asset: PreviewAsset) -> None:
-            progress_tokens.add(token)
+    try:
+        processing_result = await loop.run_in_executor(
+            None,
+            run_processing,
+            uploaded_payload,
+            ocr_engine,
+            langs,
+            session_id,
+            handle_preview_asset,
+            request_pipeline,
+        )
+    except Exception as exc:
+        if progress_tokens:
+            tokens_snapshot = set(progress_tokens)
 
-            def _apply() -> None:
+            def _rollback_tokens() -> None:
+                state.inflight_preview_tokens.difference_update(tokens_snapshot)
                 try:
-                    state.track_preview_asset(token, asset, session_id=session_id)
+                    state.remove_preview_tokens(tokens_snapshot)
                 except Exception:
                     pass
 
-            loop.call_soon_threadsafe(_apply)
+            loop.call_soon_threadsafe(_rollback_tokens)
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+    async with state.lock:
+        new_tokens = set(processing_result["preview_assets"]) | progress_tokens
+        state.inflight_preview_tokens.difference_update(new_tokens)
         if not append or state.results_payload is None:
             existing_documents: List[Dict[str, Any]] = []
             existing_split_notes: List[str] = []
-            state.results_payload = None
             state.results_df = None
-            # cleanup old cached preview files
-            state.remove_preview_tokens(set(state.preview_assets.keys()))
+            # cleanup old cached preview files, sparing requests still running
+            state.remove_preview_tokens(
+                set(state.preview_assets.keys())
+                - new_tokens
+                - state.inflight_preview_tokens
+            )
         else:
             existing_documents = list(state.results_payload.get("documents", []))
             existing_split_notes = list(
                 state.results_payload.get("meta", {}).get("split_notes", [])
             )
 
-        try:
-            processing_result = await loop.run_in_executor(
-                None,
-                run_processing,
-                uploaded_payload,
-                ocr_engine,
-                langs,
-                session_id,
-                handle_preview_asset,
-            )
-        except Exception as exc:
-            if progress_tokens:
-                tokens_snapshot = set(progress_tokens)
-
-                def _rollback_tokens() -> None:
-                    try:
-                        state.remove_preview_tokens(tokens_snapshot)
-                    except Exception:
-                        pass
-
-                loop.call_soon_threadsafe(_rollback_tokens)
-            raise HTTPException(status_code=500, detail=str(exc)) from exc
-
         new_documents = processing_result["results_payload"]["documents"]
         new_split_notes = processing_result["results_payload"]["meta"].get(
             "split_notes", []
@@ -239,59 +296,65 @@ async def process_documents(
         combined_split_notes = existing_split_notes + new_split_notes
 
         for token, asset in processing_result["preview_assets"].items():
-            if token not in state.preview_assets:
+            # Tokens dropped while in flight (session cleanup, disabled
+            # previews) had their files removed; don't resurrect them
+            if token not in state.preview_assets and asset.file_path.exists():
                 state.track_preview_asset(token, asset, session_id=session_id)
 
-        if state.results_df is not None and append and not state.results_df.empty:
-            combined_df = pd.concat(
-                [state.results_df, processing_result["dataframe"]], ignore_index=True
-            )
-        else:
-            combined_df = processing_result["dataframe"]
-        state.results_df = combined_df
+        state.append_results_df(processing_result["dataframe"])
 
+        state.pipeline.set_ocr_engine(ocr_engine)
+        state.pipeline.set_langs(langs)
         combined_meta = build_meta_from_pipeline(
             state.pipeline, len(combined_documents), combined_split_notes
         )
 
-        table_rows = build_table_rows(combined_documents, state.preview_assets)
+        # Summary-only clients page the table in through /results/table
+        table_rows = (
+            None
+            if summary_only
+            else state.table_rows(combined_documents)
+        )
         summary = calculate_summary(combined_documents)
 
         state.results_payload = {
             "documents": combined_documents,
             "meta": combined_meta,
         }
+        state.mark_results_changed()
+
+    _schedule_preview_warmup(list(processing_result["preview_assets"]))
 
     response_payload = {
         "summary": summary,
-        "table": table_rows,
         "meta": combined_meta,
         "pdfPreview": {
             "available": PDF_PREVIEW_AVAILABLE,
             "error": PDF_PREVIEW_ERROR,
         },
     }
-    return JSONResponse(response_payload)
+    if table_rows is not None:
+        response_payload["table"] = table_rows
+    return DEFAULT_RESPONSE(response_payload)
 
 
 @api_router.post("/process/split-init")
 async def process_split_init(
-    ocr_engine: str = Form("easyocr"),
+    ocr_engine: str = Form(DEFAULT_OCR_ENGINE),
     ocr_languages: str = Form("en,vi"),
     file: UploadFile = File(...),
     session_id: Optional[str] = Form(None, alias="sessionId"),
 ) -> JSONResponse:
     filename = file.filename or "document.pdf"
-    data = await file.read()
-    if not data:
+    if not _upload_size(file):
         raise HTTPException(status_code=400, detail="Uploaded file is empty.")
 
     langs = parse_languages(ocr_languages)
 
     async with state.lock:
-        job_info = create_split_job(filename, data, ocr_engine, langs, session_id=session_id)
+        job_info = create_split_job(filename, file.file, ocr_engine, langs, session_id=session_id)
 
-    return JSONResponse({
+    return DEFAULT_RESPONSE({
         "jobId": job_info["job_id"],
         "totalPages": job_info["total_pages"],
         "splitNotes": job_info["split_notes"],
@@ -302,20 +365,20 @@ async def process_split_init(
 async def process_split_next(payload: SplitNextPayload) -> JSONResponse:
     loop = asyncio.get_running_loop()
 
-    async with state.lock:
-        try:
-            prepared = prepare_job_page(payload.job_id, payload.append)
-        except KeyError as exc:
-            raise HTTPException(status_code=404, detail=str(exc)) from exc
+    # prepare/rollback only touch the job registry and never await, so they
+    # run atomically on the event loop; state.lock is kept for the merge
+    try:
+        prepared = prepare_job_page(payload.job_id, payload.append)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
 
     if prepared.get("done"):
-        return JSONResponse({"done": True})
+        return DEFAULT_RESPONSE({"done": True})
 
     try:
         execution = await loop.run_in_executor(None, execute_job_page, prepared)
     except Exception as exc:
-        async with state.lock:
-            rollback_job_page(prepared)
+        rollback_job_page(prepared)
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
     async with state.lock:
@@ -324,7 +387,8 @@ async def process_split_next(payload: SplitNextPayload) -> JSONResponse:
         except KeyError as exc:
             raise HTTPException(status_code=404, detail=str(exc)) from exc
 
-    return JSONResponse(result)
+    _schedule_preview_warmup([execution["token"]])
+    return DEFAULT_RESPONSE(result)
 
 
 @api_router.post("/session/end")
@@ -344,7 +408,7 @@ async def end_session(
             body = await request.body()
             if body:
                 try:
-                    parsed = json.loads(body.decode("utf-8"))
+                    parsed = loads(body)
                     session_id = (
                         parsed.get("sessionId")
                         or parsed.get("sessionID")
@@ -371,7 +435,7 @@ async def end_session(
             cleanup_info = state.cleanup_session(session_id)
         except Exception as exc:
             raise HTTPException(status_code=500, detail=str(exc)) from exc
-    return JSONResponse({"cleaned": cleanup_info.get("removedFiles", 0), **cleanup_info})
+    return DEFAULT_RESPONSE({"cleaned": cleanup_info.get("removedFiles", 0), **cleanup_info})
 
 
 @api_router.get("/session/end")
@@ -387,7 +451,7 @@ async def end_session_get(
             cleanup_info = state.cleanup_session(session_id)
         except Exception as exc:
             raise HTTPException(status_code=500, detail=str(exc)) from exc
-    return JSONResponse({"cleaned": cleanup_info.get("removedFiles", 0), **cleanup_info})
+    return DEFAULT_RESPONSE({"cleaned": cleanup_info.get("removedFiles", 0), **cleanup_info})
 
 
 # --- Debug/inspection endpoints for cache/session state ---
@@ -428,7 +492,7 @@ async def debug_cache() -> JSONResponse:
             "files": files,
             "previewAssets": preview_assets,
         }
-        return JSONResponse(payload)
+        return DEFAULT_RESPONSE(payload)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -439,7 +503,7 @@ async def debug_session(session_id: str) -> JSONResponse:
         paths = [str(p) for p in state.session_cache.get(session_id, set())]
         tokens = list(state.session_tokens.get(session_id, set()))
         jobs = list(state.session_jobs.get(session_id, set()))
-    return JSONResponse({
+    return DEFAULT_RESPONSE({
         "sessionId": session_id,
         "trackedCount": len(paths),
         "tokens": tokens,
@@ -467,28 +531,82 @@ async def debug_sessions() -> JSONResponse:
             }
             for token, asset in state.preview_assets.items()
         }
-    return JSONResponse({
+    return DEFAULT_RESPONSE({
         "sessions": sessions,
         "previewAssets": preview_assets,
         "previewAssetCount": len(preview_assets),
     })
 
 
+def _encode_excel() -> bytes:
+    df = state.results_df
+    buffer = BytesIO()
+    if xlsxwriter is None:
+        with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+            df.to_excel(writer, index=False, sheet_name="OCR Results")
+        return buffer.getvalue()
+
+    # constant_memory flushes each row once the next one starts, so rows are
+    # written in order here; pandas' to_excel writes column by column
+    workbook = xlsxwriter.Workbook(
+        buffer, {"constant_memory": True, "strings_to_urls": False}
+    )
+    worksheet = workbook.add_worksheet("OCR Results")
+    worksheet.write_row(0, 0, [str(column) for column in df.columns])
+    for row_index, row in enumerate(df.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_index, 0, ["" if pd.isna(value) else value for value in row])
+    workbook.close()
+    return buffer.getvalue()
+
+
+def _encode_csv() -> bytes:
+    # Rows come straight from the documents; the DataFrame only supplies the
+    # column order, skipping pandas' per-cell formatting
+    columns = list(state.results_df.columns)
+    documents = state.results_payload.get("documents", []) if state.results_payload else []
+    buffer = StringIO()
+    buffer.write("\ufeff")
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(build_csv_rows(documents, columns[len(BASE_COLUMNS):]))
+    return buffer.getvalue().encode("utf-8")
+
+
+@api_router.get("/results/table")
+async def results_table(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+) -> JSONResponse:
+    """One slice of the results table, for clients that posted /process with summaryOnly."""
+    async with state.lock:
+        if state.results_payload is None:
+            raise HTTPException(status_code=404, detail="No results available.")
+        documents = state.results_payload.get("documents", [])
+        table_rows = build_table_rows(
+            documents[offset:offset + limit], state.preview_assets
+        )
+        total = len(documents)
+
+    return DEFAULT_RESPONSE({
+        "table": table_rows,
+        "offset": offset,
+        "total": total,
+    })
+
+
 @api_router.get("/results/excel")
-async def download_excel() -> StreamingResponse:
-    if state.results_df is None or state.results_df.empty:
-        raise HTTPException(status_code=404, detail="No results available.")
+async def download_excel() -> Response:
+    async with state.lock:
+        if state.results_df is None or state.results_df.empty:
+            raise HTTPException(status_code=404, detail="No results available.")
+        data = state.cached_download("excel", _encode_excel)
 
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-        state.results_df.to_excel(writer, index=False, sheet_name="OCR Results")
-    buffer.seek(0)
     headers = {
         "Content-Disposition": 'attachment; filename="ocr_results.xlsx"',
         "Cache-Control": "no-store",
     }
-    return StreamingResponse(
-        buffer,
+    return Response(
+        content=data,
         media_type=(
             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         ),
@@ -497,36 +615,87 @@ async def download_excel() -> StreamingResponse:
 
 
 @api_router.get("/results/csv")
-async def download_csv() -> StreamingResponse:
-    if state.results_df is None or state.results_df.empty:
-        raise HTTPException(status_code=404, detail="No results available.")
+async def download_csv() -> Response:
+    async with state.lock:
+        if state.results_df is None or state.results_df.empty:
+            raise HTTPException(status_code=404, detail="No results available.")
+        data = state.cached_download("csv", _encode_csv)
 
-    csv_data = state.results_df.to_csv(index=False)
-    csv_with_bom = "\ufeff" + csv_data
-    buffer = BytesIO(csv_with_bom.encode("utf-8"))
     headers = {
         "Content-Disposition": 'attachment; filename="ocr_results.csv"',
         "Cache-Control": "no-store",
     }
-    return StreamingResponse(buffer, media_type="text/csv", headers=headers)
+    return Response(content=data, media_type="text/csv", headers=headers)
+
+
+def _accepts_gzip(request: Request) -> bool:
+    """Whether Accept-Encoding allows gzip, honouring q-values (q=0 refuses)."""
+    gzip_q: Optional[float] = None
+    wildcard_q: Optional[float] = None
+    for entry in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = entry.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == "gzip":
+            gzip_q = q
+        elif coding == "*":
+            wildcard_q = q
+    if gzip_q is None:
+        gzip_q = wildcard_q
+    return gzip_q is not None and gzip_q > 0
 
 
 @api_router.get("/results/json")
-async def download_json() -> StreamingResponse:
-    if state.results_payload is None:
-        raise HTTPException(status_code=404, detail="No results available.")
+async def download_json(request: Request) -> Response:
+    gzipped = _accepts_gzip(request)
+    async with state.lock:
+        if state.results_payload is None:
+            raise HTTPException(status_code=404, detail="No results available.")
+        data = state.cached_download(
+            "json", lambda: dumps_indented(state.results_payload)
+        )
+        compressed = state.current_download("json.gz") if gzipped else None
+        version = state.results_version
+
+    if gzipped:
+        if compressed is None:
+            # Indented JSON with repeated keys compresses several-fold; the
+            # compression runs off the event loop and outside the lock, and
+            # the result is cached alongside the plain bytes
+            loop = asyncio.get_running_loop()
+            compressed = await loop.run_in_executor(
+                None, functools.partial(gzip.compress, data, compresslevel=6, mtime=0)
+            )
+            async with state.lock:
+                state.store_download("json.gz", version, compressed)
+        data = compressed
 
-    data = json.dumps(state.results_payload, ensure_ascii=False, indent=2)
-    buffer = BytesIO(data.encode("utf-8"))
     headers = {
         "Content-Disposition": 'attachment; filename="ocr_results.json"',
         "Cache-Control": "no-store",
+        "Vary": "Accept-Encoding",
     }
-    return StreamingResponse(buffer, media_type="application/json", headers=headers)
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=data, media_type="application/json", headers=headers)
 
 
 @api_router.post("/results/update")
-async def update_results(payload: ResultsUpdatePayload) -> JSONResponse:
+async def update_results(request: Request) -> JSONResponse:
+    # Large edits are validated straight from the raw body by pydantic-core,
+    # skipping FastAPI's json.loads + per-request model validation
+    try:
+        payload = ResultsUpdatePayload.model_validate_json(await request.body())
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False)) from exc
+
     async with state.lock:
         if state.results_payload is None or state.results_df is None:
             raise HTTPException(status_code=400, detail="No processing results available.")
@@ -538,17 +707,22 @@ async def update_results(payload: ResultsUpdatePayload) -> JSONResponse:
             doc.get("file_token"): doc for doc in documents if doc.get("file_token")
         }
 
-        missing_tokens = [
-            row.file_key for row in payload.table if row.file_key not in token_to_doc
-        ]
+        # Resolve every row first so a bad token leaves the results untouched
+        updates = []
+        missing_tokens = []
+        for row in payload.table:
+            document = token_to_doc.get(row.file_key)
+            if document is None:
+                missing_tokens.append(row.file_key)
+            else:
+                updates.append((document, row))
         if missing_tokens:
             raise HTTPException(
                 status_code=404,
                 detail=f"Document(s) not found for: {', '.join(missing_tokens)}",
             )
 
-        for row in payload.table:
-            document = token_to_doc[row.file_key]
+        for document, row in updates:
             document["file_name"] = row.file_name
             document["file_path"] = row.file_path
             document["warnings"] = row.warnings
@@ -561,10 +735,68 @@ async def update_results(payload: ResultsUpdatePayload) -> JSONResponse:
 
         schema_fields = list(state.custom_schema.keys())
         state.results_df = build_dataframe(documents, schema_fields)
+        state.mark_results_changed()
+
+        # Only the edited documents need new rows
+        table_rows = state.table_rows(
+            documents, refresh={document.get("file_token") for document, _ in updates}
+        )
+
+    return DEFAULT_RESPONSE({"table": table_rows})
+
+
+def _render_page_png(asset: PreviewAsset, page: int) -> bytes:
+    images = None
+    if 'convert_from_path' in globals() and convert_from_path is not None:
+        images = convert_from_path(
+            str(asset.file_path), first_page=page, last_page=page, dpi=150
+        )
+    elif convert_from_bytes is not None:
+        with open(asset.file_path, 'rb') as fh:
+            data = fh.read()
+        images = convert_from_bytes(data, first_page=page, last_page=page, dpi=150)
+    if not images:
+        raise RuntimeError("Unable to render PDF page.")
+    buffer = BytesIO()
+    # Previews favour encode speed over size; zlib level 1 is several times
+    # faster than Pillow's default of 6 on full-page bitmaps
+    images[0].save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+async def _warm_previews(tokens: List[str]) -> None:
+    """Render the pages of freshly processed documents into the preview cache."""
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(_WARM_CONCURRENCY)
+    pages = [
+        (token, page)
+        for token in tokens
+        if token in state.preview_assets
+        for page in range(1, state.preview_assets[token].page_count + 1)
+    ][:PREVIEW_RENDER_CACHE_SIZE]
+
+    async def _warm(token: str, page: int) -> None:
+        async with slots:
+            asset = state.preview_assets.get(token)
+            if asset is None or state.cached_page_render(token, page) is not None:
+                return
+            try:
+                content = await loop.run_in_executor(
+                    _preview_pool, _render_page_png, asset, page
+                )
+            except Exception:
+                return
+            state.store_page_render(token, page, asset, content)
+
+    await asyncio.gather(*(_warm(token, page) for token, page in pages))
 
-        table_rows = build_table_rows(documents, state.preview_assets)
 
-    return JSONResponse({"table": table_rows})
+def _schedule_preview_warmup(tokens: List[str]) -> None:
+    if not PDF_PREVIEW_AVAILABLE or not tokens or PREVIEW_RENDER_CACHE_SIZE <= 0:
+        return
+    task = asyncio.get_running_loop().create_task(_warm_previews(tokens))
+    _warm_tasks.add(task)
+    task.add_done_callback(_warm_tasks.discard)
 
 
 @api_router.get("/preview/{file_key}")
@@ -578,22 +810,15 @@ async def preview_page(file_key: str, page: int = 1) -> Response:
 
     if PDF_PREVIEW_AVAILABLE:
         try:
-            images = None
-            if 'convert_from_path' in globals() and convert_from_path is not None:
-                images = convert_from_path(
-                    str(asset.file_path), first_page=page, last_page=page, dpi=150
+            content = state.cached_page_render(file_key, page)
+            if content is None:
+                loop = asyncio.get_running_loop()
+                content = await loop.run_in_executor(
+                    _preview_pool, _render_page_png, asset, page
                 )
-            elif convert_from_bytes is not None:
-                with open(asset.file_path, 'rb') as fh:
-                    data = fh.read()
-                images = convert_from_bytes(data, first_page=page, last_page=page, dpi=150)
-            if not images:
-                raise RuntimeError("Unable to render PDF page.")
-            buffer = BytesIO()
-            images[0].save(buffer, format="PNG")
-            buffer.seek(0)
-            return StreamingResponse(
-                buffer,
+                state.store_page_render(file_key, page, asset, content)
+            return Response(
+                content=content,
                 media_type="image/png",
                 headers={"Cache-Control": "no-store"},
             )
@@ -9,12 +9,16 @@ from pathlib import Path
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
-from .api import api_router
+from .api import DEFAULT_RESPONSE, api_router
 from .ui import ui_router
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="OCR Parsing Web", version="1.0.0")
+    app = FastAPI(
+        title="OCR Parsing Web",
+        version="1.0.0",
+        default_response_class=DEFAULT_RESPONSE,
+    )
 
     static_path = Path(__file__).resolve().parent / "static"
     app.mount("/static", StaticFiles(directory=static_path), name="static")
@@ -4,15 +4,16 @@ Split-processing jobs for multi-page PDFs.
 
 from __future__ import annotations
 
+import shutil
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Set
+from typing import Any, BinaryIO, Dict, List, Set
 from uuid import uuid4
 
 from pipeline import OCRParsingPipeline
 
 from .pdf_utils import split_pdf_pages, remove_cached
-from .results import build_dataframe, build_meta_from_pipeline, build_table_rows, calculate_summary, build_csv_rows
+from .results import build_dataframe, build_meta_from_pipeline, calculate_summary, build_csv_rows
 from .state import (
     state,
     generate_preview_asset,
@@ -56,7 +57,7 @@ pending_jobs: Dict[str, PendingJob] = {}
 
 def create_split_job(
     file_name: str,
-    data: bytes,
+    source: BinaryIO,
     ocr_engine: str,
     langs: List[str],
     session_id: str | None = None,
@@ -71,7 +72,8 @@ def create_split_job(
 
     safe_name = ensure_unique_name(set(), file_name, 1)
     pdf_path = temp_path / safe_name
-    pdf_path.write_bytes(data)
+    with pdf_path.open("wb") as fh:
+        shutil.copyfileobj(source, fh)
 
     split_dir = temp_path / "split"
     split_dir.mkdir(exist_ok=True)
@@ -203,7 +205,9 @@ def finalize_job_page(prepared: Dict[str, Any], execution: Dict[str, Any]) -> Di
         raise KeyError("Job not found or already completed.")
 
     if not append:
-        state.remove_preview_tokens(set(state.preview_assets.keys()))
+        state.remove_preview_tokens(
+            set(state.preview_assets.keys()) - state.inflight_preview_tokens
+        )
         existing_documents: List[Dict[str, Any]] = []
         existing_split_notes: List[str] = []
     else:
@@ -251,8 +255,9 @@ def finalize_job_page(prepared: Dict[str, Any], execution: Dict[str, Any]) -> Di
         "documents": combined_documents,
         "meta": combined_meta,
     }
+    state.mark_results_changed()
 
-    table_rows = build_table_rows(combined_documents, state.preview_assets)
+    table_rows = state.table_rows(combined_documents)
     summary = calculate_summary(combined_documents)
 
     done = not job.has_next()
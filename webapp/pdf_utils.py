@@ -71,12 +71,17 @@ def split_pdf_pages(pdf_path: Path, output_dir: Path) -> List[Path]:
 def store_pdf_in_cache(src: Path) -> Path:
     """Copy a PDF file into the preview cache directory under a unique name.
 
-    Returns the destination path inside the cache.
+    Returns the destination path inside the cache. The sources are
+    write-once temp files, so a hard link is used when possible and the
+    bytes are only copied across filesystems.
     """
     ext = src.suffix or ".pdf"
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
     dest = CACHE_DIR / f"{uuid.uuid4().hex}{ext}"
-    shutil.copy2(src, dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
     return dest
 
 
@@ -11,6 +11,9 @@ import pandas as pd
 
 from pipeline import OCRParsingPipeline
 
+# Leading columns of every results table, ahead of the schema fields
+BASE_COLUMNS = ("file_path", "confidence", "warnings")
+
 
 def build_csv_rows(
     documents: List[Dict[str, Any]],
@@ -30,48 +33,58 @@ def build_csv_rows(
     return rows
 
 
+def build_table_row(
+    doc: Dict[str, Any],
+    preview_assets: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    token = doc.get("file_token")
+    page_count = doc.get("page_count")
+    if page_count is None and preview_assets and token in preview_assets:
+        page_count = preview_assets[token].page_count
+    if page_count is None:
+        page_count = 1
+
+    page_number = doc.get("page_number", 1)
+    total_pages = doc.get("total_pages", page_count)
+    original_name = doc.get("original_file_name") or Path(doc.get("file_path", "")).name
+
+    return {
+        "fileKey": token,
+        "fileName": doc.get("file_name") or original_name,
+        "filePath": doc.get("file_path"),
+        "confidence": doc.get("confidence", 0.0),
+        "confidenceDisplay": f"{doc.get('confidence', 0.0) * 100:.1f}%",
+        "warnings": doc.get("warnings", []),
+        "fields": doc.get("extracted", {}),
+        "pageCount": page_count,
+        "originalName": original_name,
+        "pageNumber": page_number,
+        "totalPages": total_pages,
+        "pageLabel": f"Page {page_number}/{total_pages}",
+    }
+
+
 def build_table_rows(
     documents: List[Dict[str, Any]],
     preview_assets: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
-    rows: List[Dict[str, Any]] = []
-    for doc in documents:
-        token = doc.get("file_token")
-        page_count = doc.get("page_count")
-        if page_count is None and preview_assets and token in preview_assets:
-            page_count = preview_assets[token].page_count
-        if page_count is None:
-            page_count = 1
-
-        page_number = doc.get("page_number", 1)
-        total_pages = doc.get("total_pages", page_count)
-        original_name = doc.get("original_file_name") or Path(doc.get("file_path", "")).name
-
-        rows.append(
-            {
-                "fileKey": token,
-                "fileName": doc.get("file_name") or original_name,
-                "filePath": doc.get("file_path"),
-                "confidence": doc.get("confidence", 0.0),
-                "confidenceDisplay": f"{doc.get('confidence', 0.0) * 100:.1f}%",
-                "warnings": doc.get("warnings", []),
-                "fields": doc.get("extracted", {}),
-                "pageCount": page_count,
-                "originalName": original_name,
-                "pageNumber": page_number,
-                "totalPages": total_pages,
-                "pageLabel": f"Page {page_number}/{total_pages}",
-            }
-        )
-
-    return rows
+    return [build_table_row(doc, preview_assets) for doc in documents]
 
 
 def build_dataframe(documents: List[Dict[str, Any]], schema_fields: List[str]) -> pd.DataFrame:
+    columns = [*BASE_COLUMNS, *schema_fields]
     csv_rows = build_csv_rows(documents, schema_fields)
     if csv_rows:
-        return pd.DataFrame(csv_rows, dtype="string")
-    return pd.DataFrame(columns=["file_path", "confidence", "warnings", *schema_fields])
+        # Column-wise: each column is converted to a StringArray in one
+        # vectorized call instead of pandas walking the row dicts
+        return pd.DataFrame(
+            {
+                column: pd.array([row[column] for row in csv_rows], dtype="string")
+                for column in columns
+            },
+            columns=columns,
+        )
+    return pd.DataFrame(columns=columns)
 
 
 def build_meta_from_pipeline(
@@ -7,8 +7,11 @@ from __future__ import annotations
 import asyncio
 import copy
 import json
+import shutil
 import subprocess
 import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from io import BytesIO
 from pathlib import Path
@@ -20,9 +23,10 @@ from PyPDF2 import PdfReader
 
 from config import BHXH_SCHEMA
 from pipeline import OCRParsingPipeline
-from settings import PREVIEW_MAX_ASSETS
+from settings import DEFAULT_OCR_ENGINE, PREVIEW_MAX_ASSETS, PREVIEW_RENDER_CACHE_SIZE
 from .results import (
     build_csv_rows,
+    build_table_row,
     build_table_rows,
     calculate_summary,
     build_dataframe,
@@ -70,14 +74,27 @@ class AppState:
         self.custom_schema: Dict[str, Any] = copy.deepcopy(self.default_schema)
         self.pipeline = OCRParsingPipeline(
             schema=self.custom_schema,
-            ocr_engine="easyocr",
+            ocr_engine=DEFAULT_OCR_ENGINE,
             langs=["en", "vi"],
             language_pref="en",
         )
         self.lock = asyncio.Lock()
         self.results_payload: Optional[Dict[str, Any]] = None
-        self.results_df: Optional[pd.DataFrame] = None
+        # Appended batches are kept as parts and concatenated only when read
+        self._results_df_parts: List[pd.DataFrame] = []
+        self._results_df: Optional[pd.DataFrame] = None
+        # Bumped whenever the results change; keys the encoded downloads
+        self.results_version = 0
+        self._download_cache: Dict[str, Tuple[int, bytes]] = {}
         self.preview_assets: Dict[str, PreviewAsset] = {}
+        # Preview tokens of uploads still being processed (not merged yet)
+        self.inflight_preview_tokens: Set[str] = set()
+        # (ocr_engine, langs) -> pipeline for the current schema; cleared on schema changes
+        self._snapshot_pipelines: Dict[Tuple[str, Tuple[str, ...]], OCRParsingPipeline] = {}
+        # file token -> table row last built for that document
+        self._table_rows: Dict[str, Dict[str, Any]] = {}
+        # (token, page) -> (asset, encoded image); LRU order, oldest first
+        self._rendered_pages: "OrderedDict[Tuple[str, int], Tuple[PreviewAsset, bytes]]" = OrderedDict()
         # Map of session_id -> set of cached file Paths for cleanup
         self.session_cache: Dict[str, Set[Path]] = {}
         # Map of session_id -> set of file tokens (keys in preview_assets)
@@ -85,19 +102,128 @@ class AppState:
         # Map of session_id -> pending split job identifiers
         self.session_jobs: Dict[str, Set[str]] = {}
 
+    @property
+    def results_df(self) -> Optional[pd.DataFrame]:
+        parts = self._results_df_parts
+        if len(parts) > 1:
+            self._results_df = pd.concat(parts, ignore_index=True, copy=False)
+            self._results_df_parts = [self._results_df]
+        return self._results_df
+
+    @results_df.setter
+    def results_df(self, df: Optional[pd.DataFrame]) -> None:
+        self._results_df = df
+        self._results_df_parts = [df] if df is not None else []
+
+    def append_results_df(self, df: pd.DataFrame) -> None:
+        """Queue another batch of rows; the concat is deferred until results_df is read."""
+        parts = self._results_df_parts
+        if not parts or (len(parts) == 1 and parts[0].empty):
+            # Nothing to keep; concatenating an empty frame would only
+            # degrade the column dtypes
+            self.results_df = df
+        elif not df.empty:
+            self._results_df_parts.append(df)
+
+    def mark_results_changed(self) -> None:
+        """Invalidate downloads encoded from earlier results."""
+        self.results_version += 1
+        self._download_cache.clear()
+
+    def cached_download(self, kind: str, build: Callable[[], bytes]) -> bytes:
+        """Return the encoded download of the current results, building it once per version."""
+        data = self.current_download(kind)
+        if data is None:
+            data = build()
+            self.store_download(kind, self.results_version, data)
+        return data
+
+    def current_download(self, kind: str) -> Optional[bytes]:
+        """Encoded download of the current results, if already built."""
+        cached = self._download_cache.get(kind)
+        if cached is not None and cached[0] == self.results_version:
+            return cached[1]
+        return None
+
+    def store_download(self, kind: str, version: int, data: bytes) -> None:
+        """Cache a download built from results version; dropped if the results moved on."""
+        if version == self.results_version:
+            self._download_cache[kind] = (version, data)
+
+    def table_rows(
+        self, documents: List[Dict[str, Any]], refresh: Set[str] = frozenset()
+    ) -> List[Dict[str, Any]]:
+        """Table rows for documents, rebuilding only new documents and those in refresh."""
+        cached = self._table_rows
+        rows_by_token: Dict[str, Dict[str, Any]] = {}
+        rows: List[Dict[str, Any]] = []
+        for doc in documents:
+            token = doc.get("file_token")
+            row = cached.get(token) if token not in refresh else None
+            if row is None:
+                row = build_table_row(doc, self.preview_assets)
+            if token:
+                rows_by_token[token] = row
+            rows.append(row)
+        self._table_rows = rows_by_token
+        return rows
+
+    def cached_page_render(self, token: str, page: int) -> Optional[bytes]:
+        """Return a previously rendered preview page, if its asset is still current."""
+        key = (token, page)
+        cached = self._rendered_pages.get(key)
+        if cached is None:
+            return None
+        if self.preview_assets.get(token) is not cached[0]:
+            del self._rendered_pages[key]
+            return None
+        self._rendered_pages.move_to_end(key)
+        return cached[1]
+
+    def store_page_render(self, token: str, page: int, asset: PreviewAsset, data: bytes) -> None:
+        if PREVIEW_RENDER_CACHE_SIZE <= 0:
+            return
+        self._rendered_pages[(token, page)] = (asset, data)
+        self._rendered_pages.move_to_end((token, page))
+        while len(self._rendered_pages) > PREVIEW_RENDER_CACHE_SIZE:
+            self._rendered_pages.popitem(last=False)
+
     def get_schema(self) -> Dict[str, Any]:
         return copy.deepcopy(self.custom_schema)
 
     def reset_schema(self) -> Dict[str, Any]:
         self.custom_schema = copy.deepcopy(self.default_schema)
-        self.pipeline.set_schema(self.custom_schema)
+        self._schema_changed()
         return self.get_schema()
 
     def apply_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
         self.custom_schema = copy.deepcopy(schema)
-        self.pipeline.set_schema(self.custom_schema)
+        self._schema_changed()
         return self.get_schema()
 
+    def snapshot_pipeline(self, ocr_engine: str, langs: List[str]) -> OCRParsingPipeline:
+        """Pipeline bound to the current schema, safe to run without holding the lock.
+
+        One pipeline is kept per engine/language pair and reused until the
+        schema changes; in-flight requests keep the pipeline they started with.
+        """
+        key = (ocr_engine, tuple(langs))
+        pipeline = self._snapshot_pipelines.get(key)
+        if pipeline is None:
+            pipeline = OCRParsingPipeline(
+                schema=self.get_schema(),
+                ocr_engine=ocr_engine,
+                langs=list(langs),
+                language_pref=self.pipeline.language_pref,
+                schema_version=self.pipeline.schema_version,
+            )
+            self._snapshot_pipelines[key] = pipeline
+        return pipeline
+
+    def _schema_changed(self) -> None:
+        self.pipeline.set_schema(self.custom_schema)
+        self._snapshot_pipelines = {}
+
     # --- Session cache tracking helpers ---
     def register_session_assets(self, session_id: Optional[str], assets: Dict[str, "PreviewAsset"]) -> None:
         if not session_id:
@@ -164,6 +290,9 @@ class AppState:
                 break
             if candidate_token == token and overflow < len(removal_order):
                 continue
+            # Files of uploads still being processed are needed by their merge
+            if candidate_token in self.inflight_preview_tokens:
+                continue
             removed_asset = self.preview_assets.pop(candidate_token, None)
             if removed_asset is None:
                 continue
@@ -174,7 +303,11 @@ class AppState:
                 pass
             overflow -= 1
 
-        if overflow > 0 and token in self.preview_assets:
+        if (
+            overflow > 0
+            and token in self.preview_assets
+            and token not in self.inflight_preview_tokens
+        ):
             removed_asset = self.preview_assets.pop(token, None)
             if removed_asset is not None:
                 removed_entries.append((token, removed_asset.file_path))
@@ -320,14 +453,14 @@ class AppState:
             field_config["format"] = format_value
 
         self.custom_schema[name] = field_config
-        self.pipeline.set_schema(self.custom_schema)
+        self._schema_changed()
         return self.get_schema()
 
     def delete_field(self, field_name: str) -> Dict[str, Any]:
         if field_name not in self.custom_schema:
             raise ValueError(f"Field '{field_name}' not found.")
         del self.custom_schema[field_name]
-        self.pipeline.set_schema(self.custom_schema)
+        self._schema_changed()
         return self.get_schema()
 
 
@@ -393,19 +526,26 @@ def run_processing(
     ocr_languages: List[str],
     session_id: Optional[str] = None,
     progress_callback: Optional[Callable[[str, PreviewAsset], None]] = None,
+    pipeline: Optional[OCRParsingPipeline] = None,
 ) -> Dict[str, Any]:
     """
     Run the OCR parsing pipeline synchronously (invoked inside a threadpool).
+
+    Pass a pipeline from ``state.snapshot_pipeline`` to run without holding
+    ``state.lock``; otherwise the shared pipeline is reconfigured and used.
     """
-    schema = state.get_schema()
+    if pipeline is None:
+        pipeline = state.pipeline
+        schema = state.get_schema()
+        pipeline.set_ocr_engine(ocr_engine)
+        pipeline.set_langs(ocr_languages)
+    else:
+        schema = pipeline.schema
     schema_fields = list(schema.keys())
     documents: List[Dict[str, Any]] = []
     preview_assets: Dict[str, PreviewAsset] = {}
     split_notes: List[str] = []
 
-    state.pipeline.set_ocr_engine(ocr_engine)
-    state.pipeline.set_langs(ocr_languages)
-
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_dir_path = Path(temp_dir)
         written_files: List[Path] = []
@@ -414,7 +554,8 @@ def run_processing(
         for index, item in enumerate(uploaded_files, start=1):
             safe_name = ensure_unique_name(seen_names, item["name"], index)
             file_path = temp_dir_path / safe_name
-            file_path.write_bytes(item["data"])
+            with file_path.open("wb") as fh:
+                shutil.copyfileobj(item["file"], fh)
             written_files.append(file_path)
 
         split_dir = temp_dir_path / "split_pages"
@@ -449,6 +590,7 @@ def run_processing(
                 }
 
         schema_fields_set = set(schema_fields)
+        parse_jobs: List[Tuple[Path, str, Dict[str, Any], PreviewAsset]] = []
 
         for pdf_path in files_to_process:
             token = uuid4().hex
@@ -473,20 +615,26 @@ def run_processing(
                     "total_pages": preview_asset.page_count,
                 },
             )
-            document_result = parse_document_path(
-                pdf_path,
-                token,
-                meta,
-                schema_fields_set,
-                preview_asset,
+            parse_jobs.append((pdf_path, token, meta, preview_asset))
+
+        # Pages are parsed concurrently; the pipeline's OCR/LLM slots bound
+        # the requests actually in flight
+        workers = min(pipeline.max_concurrency, len(parse_jobs)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            documents.extend(
+                executor.map(
+                    lambda job: parse_document_path(
+                        job[0], job[1], job[2], schema_fields_set, job[3], pipeline
+                    ),
+                    parse_jobs,
+                )
             )
-            documents.append(document_result)
 
     dataframe = build_dataframe(documents, schema_fields)
 
     results_payload = {
         "documents": documents,
-        "meta": build_meta_from_pipeline(state.pipeline, len(documents), split_notes),
+        "meta": build_meta_from_pipeline(pipeline, len(documents), split_notes),
     }
 
     table_rows = build_table_rows(documents, preview_assets)